@@ -7,6 +7,22 @@
 #--------------------------------------------------------------------------------------------
 # Changelog (Reborn version)
 #
+# v1.2.0
+#   - Automatic tabs are spaced evenly along the outline of the base instead of depending on where its points happen to be. Corners still always get one.
+#   - Tabs are tracked properly now, including ones loaded from a project, so Remove All Tabs really does remove all of them (and nothing else).
+#   - Removing tabs can be limited to the selected objects or an area of the build plate, and is a single undo step however many tabs go.
+#   - Option to merge the automatic tabs for each object into one, which keeps things snappier with lots of tabs.
+#   - Moved the geometry maths into TabGeometry.py so it can be benchmarked without Cura (see benchmarks/).
+#   - Timings for adding and removing tabs, shown in the tool panel if tabawreborn/show_timings is turned on. Debug logging only formats messages that actually get logged.
+#   - Automatic tabs get put back around the base of their object when it gets rotated or scaled, without redoing any other object.
+#   - Base layers option: automatic tabs go around the footprint of the first few layers, not just the first one. Finding the base only looks at faces near the bottom now.
+#   - Corners only option for automatic tabs, which puts them where warping is most likely instead of all the way around.
+#   - Clicking to add a tab works out where you clicked from the camera straight away instead of rendering the scene and waiting for messages to get out of the way. Falls back to the old way if it has to.
+#   - Paint Tabs mode: click and drag along an object to add a row of tabs, previewed as you go and added in one go when you let go.
+#   - Notifications that keep coming up (like when adding lots of tabs) show once with a count instead of over and over, and the panel only updates once a frame.
+#   - Adding tabs automatically works out the bases in the background, with progress in the tool panel and a Cancel button, so Cura doesn't freeze on big plates.
+#   - Tabs get as many sides as they need to print round for their size and your line width, instead of always 36. Small tabs are a lot lighter.
+#   - Tab meshes share vertices between faces instead of every triangle having its own, so they're about a third of the size.
 # v1.1.0
 #   - Copied my patent-not-pending BaseDetect™ system over from Spoon Anti-Warping Reborn to place tabs around the object base, not the convex hull.
 #   - Fixed a couple of minor bugs which wouldn't have been there if I was paying attention in the first place.
@@ -37,14 +53,26 @@
 # There seems to be a bug with UM.Message.Message that makes PickingPass go wildly off course if there's one on screen.
 # Hence why I rolled my own. It's much inferior, except that it doesn't seem to break things.
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import heapq
+import itertools
+import json
 import math
 import os.path
-from typing import List
+import threading
+import time
+from typing import Callable, List
+import weakref
 
 import numpy as np
 from scipy.spatial import ConvexHull
-import trimesh
+try:
+    import trimesh
+except ImportError:
+    trimesh = None  # Only needed as a fallback for sectioning meshes
 from cura.CuraApplication import CuraApplication
 from cura.Operations.SetParentOperation import SetParentOperation
 from cura.PickingPass import PickingPass
@@ -56,10 +84,10 @@ from PyQt6.QtQml import QJSValue
 from PyQt6.QtWidgets import QApplication
 from UM.Event import Event, MouseEvent
 from UM.i18n import i18nCatalog
+from UM.Job import Job
 from UM.Logger import Logger
 from UM.Math.Polygon import Polygon
 from UM.Math.Vector import Vector
-from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Mesh.MeshData import MeshData
 from UM.Message import Message
 from UM.Operations.AddSceneNodeOperation import AddSceneNodeOperation
@@ -67,18 +95,66 @@ from UM.Operations.GroupedOperation import GroupedOperation
 from UM.Operations.RemoveSceneNodeOperation import RemoveSceneNodeOperation
 from UM.Operations.TranslateOperation import TranslateOperation
 from UM.Resources import Resources
-from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
 from UM.Scene.Selection import Selection
 from UM.Settings.SettingInstance import SettingInstance
 from UM.Tool import Tool
 
+from . import TabGeometry
+
 @dataclass
 class Notification:
     """Holds info for a notification message since I can't use UM.Message"""
     text: str  # If I need to explain this you're probably not qualified to work with this code.
     lifetime: float  # Notification lifetime in seconds
     id: int  # Becasue we've all gotten our notifications mixed up while out shopping... right?
+    expires: float = 0.0  # time.monotonic() when it goes away. Showing the same thing again pushes it back.
+    count: int = 1  # How many times it's been shown while it was still up
+
+@dataclass
+class TabStackSnapshot:
+    """Settings tabs need from the global/extruder stacks, read once instead of for every tab"""
+    layer_height_0: float
+    layer_height: float
+    line_width: float
+    support_type: str
+    support_xy_distance: float
+    support_infill_rate: float
+
+@dataclass(frozen=True)
+class AutoTabPlacement:
+    """How automatic tabs were placed, so they can be placed again the same way"""
+    spacing: float  # Minimum distance between tabs
+    include_corners: bool = True  # Always put one on sharp corners (evenly spaced mode)
+    count: int = 0  # Exact number per outline instead of going by spacing (evenly spaced mode)
+    corners_only: bool = False  # Only put tabs where they're most likely to be needed
+    threshold: float = 0.5  # Lowest warp risk score to get a tab (corners only)
+    budget: int = 8  # Most tabs per object, 0 for no limit (corners only)
+
+@dataclass
+class AutoTabRequest:
+    """Everything needed to finish adding automatic tabs once the base outlines come back from the background"""
+    nodes: list[CuraSceneNode]
+    heights: tuple[float, ...]
+    auto_placement: AutoTabPlacement
+    outlines: list  # Base outlines for each node, None until they've been worked out
+    pending: list[tuple[int, tuple]]  # (index into nodes, geometry) for the ones being worked out
+    transforms: list[bytes]  # World transformation of each node when it started, to spot any that moved in the meantime
+    started: float  # time.perf_counter() when it started
+
+@dataclass
+class PaintStroke:
+    """Tabs being painted on in one drag of the mouse, which don't get added for real until it's let go"""
+    node: CuraSceneNode  # What's being painted around. Stays the same for the whole stroke so moving doesn't need a selection pass.
+    painted_hash: TabGeometry.TabSpatialHash  # Just the tabs painted so far
+    plate_edges: tuple[float, float, float, float]  # Left, right, front and rear limits for the middle of a tab
+    positions: list[Vector] = field(default_factory=list)  # Where the tabs go
+    previews: SceneNode = None  # Holds the stand-ins showing where they'll go, so the scene root only changes at the start and end
+    last_mouse: tuple[float, float] = None
+    last_hit: tuple[float, float] = None  # Where on the build plate (X/Z) the stroke was last
+    travelled: float = 0.0  # How far it's gone along the build plate since the last tab
+    problem: str = ""  # Why the last spot that couldn't have a tab couldn't, for if none get placed at all
 
 Resources.addSearchPath(
     os.path.join(os.path.abspath(os.path.dirname(__file__)))
@@ -91,49 +167,381 @@ if catalog.hasTranslationLoaded():
 
 DEBUG_MODE = False
 
-def log(level: str, message: str) -> None:
-    """Wrapper function for logging messages using Cura's Logger, but with debug mode so as not to spam you."""
-    if level == "d" and DEBUG_MODE:
-        Logger.log("d", message)
-    elif level == "dd":
-        Logger.log("d", message)
-    elif level == "i":
-        Logger.log("i", message)
-    elif level == "w":
-        Logger.log("w", message)
-    elif level == "e":
-        Logger.log("e", message)
-    elif DEBUG_MODE:
-        Logger.log("w", f"Invalid log level: {level} for message {message}")
+TAB_NODE_NAME = "AdhesionTab"  # Saved in project files, so it's part of how tabs get recognised after loading one
+TAB_FOOTPRINTS_KEY = "tabawreborn_footprints"  # Node metadata (which goes in project files) with where each tab in a node is
+TAB_AUTO_PLACEMENT_KEY = "tabawreborn_auto_placement"  # Node metadata with how automatic tabs were placed
+TAB_PREVIEW_NODE_NAME = "AdhesionTabPreview"  # Painted tabs before the mouse is let go. Never saved.
+TAB_CHORD_ERROR = 0.25  # How far in from a true circle (in line widths) the flat sides of a tab can go. Sets how many segments it gets.
+TAB_MIN_SEGMENTS = 8  # Fewest segments around the circumference of a tab, however small it is
+TAB_MAX_SEGMENTS = 120  # Most segments around the circumference of a tab, however big it is
+TAB_TEMPLATE_CACHE_SIZE = 16  # How many differently shaped tab meshes to keep around
+BASE_OUTLINE_CACHE_SIZE = 64  # How many nodes to remember the base outlines of
+FACE_INDEX_REACH = 2.0  # How far up from the bottom (mm) the face index for finding the base covers, so changing the base layers rarely needs a new one
+TAB_RESEAT_DELAY = 250  # Milliseconds to wait after an object stops changing before moving its automatic tabs
+RAY_CASTER_CACHE_FACES = 4_000_000  # Total faces of the meshes to keep ray casters for. They take about 28 bytes a face.
+RAY_SCAN_MAX_FACES = 1_000_000  # Biggest mesh to check every face of for a click while its ray caster is being built. Bigger ones get a render.
+PAINT_SCAN_MAX_FACES = 100_000  # Same but for each mouse move while painting, which happen a lot more often
+NOTIFICATION_UPDATE_INTERVAL = 16  # Milliseconds between updates to the notifications in the panel, about one a frame
+
+LOG_LEVELS = {"d": "d", "dd": "d", "i": "i", "w": "w", "e": "e"}  # "dd" is debug that shows up even without DEBUG_MODE
+
+def log(level: str, message: str, *args) -> None:
+    """Wrapper function for logging messages using Cura's Logger, but with debug mode so as not to spam you.
+
+    Anything in args gets %-formatted into the message, but only if it's actually going to be logged."""
+    if level == "d" and not DEBUG_MODE:
+        return
+    if level not in LOG_LEVELS:
+        if DEBUG_MODE:
+            Logger.log("w", f"Invalid log level: {level} for message {message}")
+        return
+    Logger.log(LOG_LEVELS[level], message % args if args else message)
 
-class TabAnitWarpingReborn(Tool):
+@dataclass
+class PerfSpan:
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    last: float = 0.0
+
+class PerfStats:
+    """How many times each slow bit has run and how long it took, so there's some way to tell where the time goes."""
 
     def __init__(self) -> None:
+        self._spans: dict[str, PerfSpan] = {}
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Add a time in seconds for something that couldn't be wrapped in a span, like a background job."""
+        span = self._spans.setdefault(name, PerfSpan())
+        span.count += 1
+        span.total += elapsed
+        span.longest = max(span.longest, elapsed)
+        span.last = elapsed
+        log("d", "%s took %.2f ms", name, elapsed * 1000)
+
+    def reset(self) -> None:
+        self._spans.clear()
+
+    def summary(self) -> str:
+        """One line per span: how many times, then last/average/longest in milliseconds."""
+        return "\n".join(
+            f"{name}: {span.count}x, last {span.last * 1000:.1f}, avg {span.total / span.count * 1000:.1f}, max {span.longest * 1000:.1f} ms"
+            for name, span in sorted(self._spans.items()))
+
+class TabDecorator(SceneNodeDecorator):
+    """Marks a scene node as a tab this plugin made."""
+
+    def __init__(self, footprints: np.ndarray = None, auto_placement: AutoTabPlacement = None) -> None:
+        super().__init__()
+        # Centre of each tab in the node relative to the node. Only more than one if they've been merged.
+        self._footprints: np.ndarray = footprints if footprints is not None else np.zeros((1, 2))
+        # How it was placed if it was placed automatically
+        self._auto_placement = auto_placement
+
+    def isAntiWarpingTab(self) -> bool:
+        return True
+
+    def getTabFootprints(self) -> np.ndarray:
+        return self._footprints
+
+    def getTabAutoPlacement(self) -> AutoTabPlacement:
+        return self._auto_placement
+
+    def __deepcopy__(self, memo) -> "TabDecorator":
+        return TabDecorator(self._footprints.copy(), self._auto_placement)
+
+def _save_tab_metadata(node: SceneNode, footprints: np.ndarray, auto_placement: AutoTabPlacement) -> None:
+    """Copy what a TabDecorator knows into the node's metadata. Decorators don't get saved in projects but that does."""
+    metadata = getattr(node, "metadata", None)
+    if metadata is None:
+        # Cura from before nodes had metadata
+        return
+    if footprints is not None:
+        metadata[TAB_FOOTPRINTS_KEY] = json.dumps(np.round(np.asarray(footprints, dtype=np.float64), 4).tolist())
+    if auto_placement is not None:
+        metadata[TAB_AUTO_PLACEMENT_KEY] = json.dumps(asdict(auto_placement))
+
+def _load_tab_decorator(node: SceneNode) -> "TabDecorator":
+    """A TabDecorator for a tab loaded from a project, with whatever _save_tab_metadata saved for it."""
+    metadata = getattr(node, "metadata", None) or {}
+    footprints = None
+    auto_placement = None
+    try:
+        if TAB_FOOTPRINTS_KEY in metadata:
+            footprints = np.asarray(json.loads(metadata[TAB_FOOTPRINTS_KEY]), dtype=np.float64).reshape(-1, 2)
+        if TAB_AUTO_PLACEMENT_KEY in metadata:
+            auto_placement = AutoTabPlacement(**json.loads(metadata[TAB_AUTO_PLACEMENT_KEY]))
+    except (TypeError, ValueError) as e:
+        log("w", f"Couldn't read the saved tab details of {node.getName()}: {e}")
+    if footprints is not None and footprints.shape[0] == 0:
+        footprints = None
+    return TabDecorator(footprints, auto_placement)
+
+def _looks_like_tab(node: SceneNode) -> bool:
+    """Whether a node without a TabDecorator is a tab that came from a project file or before the plugin was reloaded.
+
+    Decorators aren't saved in projects but the name and per-object settings are, and no other support mesh has this combination."""
+    if not node.getName().startswith(TAB_NODE_NAME):
+        return False
+    node_stack = node.callDecoration("getStack")
+    if not node_stack:
+        return False
+    return bool(node_stack.getProperty("support_mesh", "value")) and not node_stack.getProperty("support_mesh_drop_down", "value")
+
+class TabRegistry:
+    """Keeps track of which nodes in the scene are tabs and which are models you can put tabs on.
+
+    Updated from sceneChanged as nodes get added and removed so nothing has to walk the whole scene to find out.
+    Only holds weak references to nodes, so it never keeps something alive that the scene (and undo stack) let go of."""
+
+    def __init__(self, scene, on_tab_added: Callable[[SceneNode], None] = None, on_node_changed: Callable[[SceneNode], None] = None,
+                 on_node_forgotten: Callable[[SceneNode], None] = None) -> None:
+        self._scene = scene
+        self._on_tab_added = on_tab_added
+        # Told about every tab or model that gets added, and anything the scene says changed (or moved)
+        self._on_node_changed = on_node_changed
+        # Told about every tab or model that stops being tracked
+        self._on_node_forgotten = on_node_forgotten
+        self._initialised: bool = False
+        self._tabs: weakref.WeakSet[SceneNode] = weakref.WeakSet()
+        self._tabs_by_parent: weakref.WeakKeyDictionary[SceneNode, weakref.WeakSet] = weakref.WeakKeyDictionary()
+        self._tab_parents: weakref.WeakKeyDictionary[SceneNode, weakref.ref] = weakref.WeakKeyDictionary()
+        # Models and the order they were found in (scene order to start with, then the order they get added), since
+        # a WeakSet comes back in a different order every time and anything placing tabs across objects should be repeatable
+        self._models: weakref.WeakKeyDictionary[SceneNode, int] = weakref.WeakKeyDictionary()
+        self._model_sequence = itertools.count()
+        # Children of each node last time it was looked at. Weak both ways, a child holds on to its parent so a strong set
+        # in here would keep the key alive forever.
+        self._children: weakref.WeakKeyDictionary[SceneNode, weakref.WeakSet[SceneNode]] = weakref.WeakKeyDictionary()
+        scene.sceneChanged.connect(self._onSceneChanged)
+
+    def hasTabs(self) -> bool:
+        self._ensure_initialised()
+        return len(self._tabs) > 0
+
+    def getTabs(self) -> list[SceneNode]:
+        self._ensure_initialised()
+        return list(self._tabs)
+
+    def getTabsOf(self, parent: SceneNode) -> list[SceneNode]:
+        """Tabs attached to a particular object."""
+        self._ensure_initialised()
+        return list(self._tabs_by_parent.get(parent, ()))
+
+    def getModels(self) -> list[SceneNode]:
+        """Every model, in the order they were found."""
+        self._ensure_initialised()
+        return sorted(self._models.keys(), key = self._models.__getitem__)
+
+    def isTab(self, node: SceneNode) -> bool:
+        self._ensure_initialised()
+        return node in self._tabs
+
+    def isModel(self, node: SceneNode) -> bool:
+        self._ensure_initialised()
+        return node in self._models
+
+    def _ensure_initialised(self) -> None:
+        """Look at the whole scene once. Everything after that comes from scene changes."""
+        if self._initialised:
+            return
+        self._initialised = True
+        self._add(self._scene.getRoot())
+
+    def _onSceneChanged(self, source: SceneNode) -> None:
+        # The scene gets told about the node whose children changed (or that moved, which is cheap to check)
+        if not self._initialised or not isinstance(source, SceneNode):
+            return
+        # Paint previews come and go with every mouse move, there's never anything in there to track
+        if source.getName() == TAB_PREVIEW_NODE_NAME:
+            return
+        if self._on_node_changed is not None and source is not self._scene.getRoot():
+            self._on_node_changed(source)
+        current = set(source.getChildren())
+        previous = set(self._children.get(source, ()))
+        if current == previous:
+            return
+        for node in previous - current:
+            self._forget(node)
+        # In the order they're in the scene, so models keep a repeatable order
+        for node in source.getChildren():
+            if node not in previous:
+                self._add(node)
+        if current:
+            self._children[source] = weakref.WeakSet(current)
+        else:
+            self._children.pop(source, None)
+
+    def _add(self, node: SceneNode) -> None:
+        """Start tracking a node and everything under it."""
+        if node.callDecoration("isSliceable"):
+            if not node.callDecoration("isAntiWarpingTab") and _looks_like_tab(node):
+                node.addDecorator(_load_tab_decorator(node))
+            if node.callDecoration("isAntiWarpingTab"):
+                self._add_tab(node)
+            else:
+                node_stack = node.callDecoration("getStack")
+                if node_stack and not any(node_stack.getProperty(mesh_type, "value") for mesh_type in ("support_mesh", "infill_mesh", "cutting_mesh", "anti_overhang_mesh")):
+                    self._models.setdefault(node, next(self._model_sequence))
+                    if self._on_node_changed is not None:
+                        self._on_node_changed(node)
+        children = node.getChildren()
+        if children:
+            self._children[node] = weakref.WeakSet(children)
+            for child in children:
+                self._add(child)
+
+    def _add_tab(self, node: SceneNode) -> None:
+        self._tabs.add(node)
+        parent = node.getParent()
+        if parent is None:
+            return
+        if parent not in self._tabs_by_parent:
+            self._tabs_by_parent[parent] = weakref.WeakSet()
+        self._tabs_by_parent[parent].add(node)
+        self._tab_parents[node] = weakref.ref(parent)
+        if self._on_tab_added is not None:
+            self._on_tab_added(node)
+        if self._on_node_changed is not None:
+            self._on_node_changed(node)
+
+    def _forget(self, node: SceneNode) -> None:
+        """Stop tracking a node and everything that was under it."""
+        if self._on_node_forgotten is not None and (node in self._tabs or node in self._models):
+            self._on_node_forgotten(node)
+        self._tabs.discard(node)
+        self._models.pop(node, None)
+        parent_ref = self._tab_parents.pop(node, None)
+        parent = parent_ref() if parent_ref is not None else None
+        if parent is not None and parent in self._tabs_by_parent:
+            self._tabs_by_parent[parent].discard(node)
+        for child in list(self._children.pop(node, ())):
+            self._forget(child)
+
+class BaseOutlineJob(Job):
+    """Works out base hulls for a batch of nodes in the background.
+
+    Only gets plain arrays, never the nodes themselves, so nothing in Cura gets touched off the main thread.
+    Reports progress as each node finishes, and stops as soon as it can once cancelled."""
+
+    def __init__(self, pending: list[tuple[int, tuple]], heights: tuple[float, ...], compute: Callable) -> None:
+        super().__init__()
+        self._pending = pending
+        self._heights = heights
+        self._compute = compute
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        super().cancel()
+
+    def isCancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self) -> None:
+        outcomes = [None] * len(self._pending)
+        with ThreadPoolExecutor(max_workers=min(len(self._pending), os.cpu_count() or 1)) as executor:
+            futures = {executor.submit(self._compute, *geometry, self._heights): i for i, (_, geometry) in enumerate(self._pending)}
+            for done, future in enumerate(as_completed(futures), 1):
+                if self._cancelled.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
+                outcomes[futures[future]] = future.result()
+                self.progress.emit(self, done * 100 // len(self._pending))
+        self.setResult(outcomes)
+
+class RayCasterJob(Job):
+    """Builds a MeshRayCaster in the background, so the first click on a big mesh doesn't have to wait for it."""
+
+    def __init__(self, mesh_data: MeshData, vertices: np.ndarray, faces: np.ndarray) -> None:
         super().__init__()
+        self.mesh_ref = weakref.ref(mesh_data)
+        self.key = id(mesh_data)
+        self._vertices = vertices
+        self._faces = faces
+
+    def run(self) -> None:
+        self.setResult(TabGeometry.MeshRayCaster(self._vertices, self._faces))
+
+class TabAnitWarpingReborn(Tool):
 
-        # List of tabs we've created
-        self._scene_tabs = []
+    def __init__(self) -> None:
+        super().__init__()
 
         # variable for menu dialog
         self._tab_size: float = 0.0
         self._xy_distance: float = 0.0
         self._as_dish: bool = False
+        self._merge_tabs: bool = False
+        self._paint_mode: bool = False
         self._layer_count: int = 1
+        self._base_layers: int = 1
         self._inputs_valid: bool = False
         self._hide_toasts: bool = True
 
         self._any_as_dish = False # Track if any dish supports have been created
 
+        # Tab meshes at the origin, keyed by everything which changes their shape. Least recently used at the front.
+        self._tab_templates: OrderedDict[tuple, tuple[np.ndarray, np.ndarray, np.ndarray]] = OrderedDict()
+        # MeshData currently used by tabs, with the same keys
+        self._tab_mesh_data: weakref.WeakValueDictionary[tuple, MeshData] = weakref.WeakValueDictionary()
+
+        # Base outlines of nodes by id(node), along with what they were worked out from so they can be checked before reuse
+        self._base_outline_cache: OrderedDict[int, tuple] = OrderedDict()
+        # Faces near the bottom of nodes sorted by height, which only need redoing if a node is rotated or scaled
+        self._face_index_cache: OrderedDict[int, tuple] = OrderedDict()
+        # For working out where a click lands without rendering anything, by id(mesh data) with a reference to check it's
+        # still the same mesh. Works in the mesh's own coordinates so it's good as long as the mesh is. Least recently used at the front.
+        self._ray_casters: OrderedDict[int, tuple[weakref.ref, TabGeometry.MeshRayCaster]] = OrderedDict()
+        # Ones being built in the background, with the same keys
+        self._ray_caster_jobs: dict[int, RayCasterJob] = {}
+
+        # Timings for the slow bits. Only shown in the panel if tabawreborn/show_timings is turned on.
+        self._perf_stats = PerfStats()
+        self._show_timings: bool = False
+
         # Shortcut
         self._shortcut_key = Qt.Key.Key_J
         self._controller = self.getController()
         self._selection_pass = None
         self._application = CuraApplication.getInstance()
 
-        self.setExposedProperties("TabSize", "XYDistance", "AsDish", "LayerCount", "InputsValid", "Notifications", "LogMessage")
+        self.setExposedProperties("TabSize", "XYDistance", "AsDish", "MergeTabs", "PaintMode", "LayerCount", "BaseLayers", "InputsValid", "Notifications", "LogMessage", "PerfStats", "AutoProgress")
+
+        # Objects with automatic tabs, and the rotation/scale part of their transformation when the tabs were placed.
+        # When that changes the tabs get put back around the new base.
+        self._reseat_watched: weakref.WeakKeyDictionary[SceneNode, np.ndarray] = weakref.WeakKeyDictionary()
+        self._reseat_pending: weakref.WeakSet[SceneNode] = weakref.WeakSet()
+        self._reseat_timer = QTimer()
+        self._reseat_timer.setInterval(TAB_RESEAT_DELAY)
+        self._reseat_timer.setSingleShot(True)
+        self._reseat_timer.timeout.connect(self._reseat_pending_tabs)
+
+        # Every tab and object base, for overlap checks. Built the first time it's needed then kept up to date from the
+        # registry: nodes that change get marked and only those get redone next time it's used.
+        self._placement_hash: TabGeometry.TabSpatialHash = None
+        self._placement_dirty: weakref.WeakSet[SceneNode] = weakref.WeakSet()
+        self._placement_heights: tuple[float, ...] = ()
+
+        # Which nodes are tabs and which are models, without walking the scene to find out
+        self._tab_registry = TabRegistry(self._controller.getScene(), self._onTabAdded, self._onPlacementNodeChanged, self._onPlacementNodeForgotten)
 
         CuraApplication.getInstance().globalContainerStackChanged.connect(self._updateEnabled)
 
+        # Settings tabs need, cached until something in the stacks changes
+        self._stack_snapshot: TabStackSnapshot = None
+        self._watched_stacks: list = []
+        CuraApplication.getInstance().globalContainerStackChanged.connect(self._onGlobalContainerStackChanged)
+        self._onGlobalContainerStackChanged()
+
         # Note: if the selection is cleared with this tool active, there is no way to switch to
         # another tool than to reselect an object (by clicking it) because the tool buttons in the
         # toolbar will have been disabled. That is why we need to ignore the first press event
@@ -152,31 +560,74 @@ class TabAnitWarpingReborn(Tool):
         self._preferences.addPreference("tabawreborn/tab_size", 10)
         self._preferences.addPreference("tabawreborn/xy_distance", 0.16)
         self._preferences.addPreference("tabawreborn/create_dish", False)
+        self._preferences.addPreference("tabawreborn/merge_tabs", False)
+        self._preferences.addPreference("tabawreborn/paint_mode", False)
         self._preferences.addPreference("tabawreborn/layer_count", 1)
+        self._preferences.addPreference("tabawreborn/base_layers", 1)
+        self._preferences.addPreference("tabawreborn/show_timings", False)
 
         self._tab_size = float(self._preferences.getValue("tabawreborn/tab_size"))
         self._xy_distance = float(self._preferences.getValue("tabawreborn/xy_distance"))
         self._as_dish = bool(self._preferences.getValue("tabawreborn/create_dish"))
+        self._merge_tabs = bool(self._preferences.getValue("tabawreborn/merge_tabs"))
+        self._paint_mode = bool(self._preferences.getValue("tabawreborn/paint_mode"))
+        self._show_timings = bool(self._preferences.getValue("tabawreborn/show_timings"))
         self._layer_count = int(self._preferences.getValue("tabawreborn/layer_count"))
+        self._base_layers = int(self._preferences.getValue("tabawreborn/base_layers"))
 
         # Hold variables needed for the deferred PickingPass
         self._last_picked_node: CuraSceneNode = None
         self._last_event: Event = None
 
+        # Automatic tabs being worked out in the background, and how far along they are (-1 when there aren't any)
+        self._auto_job: BaseOutlineJob = None
+        self._auto_request: AutoTabRequest = None
+        self._auto_progress: int = -1
+
+        # Click and drag in paint mode, None when there isn't one going
+        self._paint_stroke: PaintStroke = None
+
         self._are_messages_hidden: bool = False
         self._hidden_messages: list[Message] = []
 
         self._default_message_title = catalog.i18nc("@message:title", "Tab Anti-Warping Reborn")
 
-        self._notifications: list[Notification] = []
+        # Current notifications by text so repeats just bump the count, oldest first
+        self._notifications: dict[str, Notification] = {}
         self._notification_next_id: int = 0
         self._notifications_string: str = ""
+        # (expires, id, text) for every notification, soonest first. Entries left over from a notification being
+        # pushed back or already gone get skipped when they come up rather than dug out.
+        self._notification_expiry: list[tuple[float, int, str]] = []
+        self._notification_timer = QTimer()
+        self._notification_timer.setSingleShot(True)
+        self._notification_timer.timeout.connect(self._expire_notifications)
+        self._notification_timer_due: float = math.inf
+        # However many notifications come and go in a batch, the panel only gets told once a frame
+        self._notification_update_timer = QTimer()
+        self._notification_update_timer.setInterval(NOTIFICATION_UPDATE_INTERVAL)
+        self._notification_update_timer.setSingleShot(True)
+        self._notification_update_timer.timeout.connect(self._update_notifications_property)
 
     def event(self, event) -> None:
         super().event(event)
         modifiers = QApplication.keyboardModifiers()
         ctrl_is_active = modifiers & Qt.KeyboardModifier.ControlModifier
 
+        if self._paint_stroke is not None:
+            if event.type == Event.MouseMoveEvent and MouseEvent.LeftButton in event.buttons:
+                self._continue_paint_stroke(event)
+                return True
+            if event.type in (Event.MouseMoveEvent, Event.MouseReleaseEvent):
+                # A move without the button down means it got let go somewhere we didn't hear about
+                self._finish_paint_stroke()
+                return True
+            if event.type == Event.ToolDeactivateEvent:
+                self._cancel_paint_stroke()
+
+        if event.type == Event.ToolActivateEvent:
+            self._prepare_selected_ray_casters()
+
         if event.type == Event.MousePressEvent and MouseEvent.LeftButton in event.buttons and self._controller.getToolsEnabled():
             if ctrl_is_active:
                 self._controller.setActiveTool("TranslateTool")
@@ -200,7 +651,7 @@ class TabAnitWarpingReborn(Tool):
             if not picked_node:
                 # There is no slicable object at the picked location
                 return
-            log("d", f"picked_node = {picked_node}")
+            log("d", "picked_node = %s", picked_node)
             if not self._inputs_valid:
                 log("d", "Tried to create tab with invalid inputs")
                 self._notification_add(catalog.i18nc("add_tab_invalid_input", "Cannot create a tab while some of the settings are not valid. Please check the tool's settings."), 10)
@@ -210,6 +661,20 @@ class TabAnitWarpingReborn(Tool):
             self._last_picked_node = picked_node
             self._last_event = event
 
+            # Clicking a tab (or something else that can't have one) doesn't need a position at all, and for models
+            # the camera ray can usually say where the click landed. Either way there's nothing to render or wait for.
+            node_stack = picked_node.callDecoration("getStack")
+            if node_stack and any(node_stack.getProperty(mesh_type, "value") for mesh_type in ("support_mesh", "anti_overhang_mesh", "infill_mesh")):
+                self._picking_pass()
+                return
+            if self._paint_mode and self._start_paint_stroke(picked_node, event):
+                return True
+            with self._perf_stats.span("pick.analytic"):
+                picked_position = self._analytic_pick(picked_node, event)
+            if picked_position is not None:
+                self._picking_pass(picked_position)
+                return
+
             # Hide all currently shown messages
             if self._hide_toasts:
                 try:  # In a try...except for now at least, just to make sure anything gets caught
@@ -221,17 +686,106 @@ class TabAnitWarpingReborn(Tool):
             log("d", "event() set the timer")
             return
 
-    def _picking_pass(self):
+    def _picking_pass(self, picked_position: Vector = None):
+        with self._perf_stats.span("pick.total"):
+            self._pick_and_place(picked_position)
+        self._perf_stats_changed()
+
+    def _analytic_pick(self, node: CuraSceneNode, event, scan_limit: int = RAY_SCAN_MAX_FACES) -> Vector:
+        """Where a click landed on a node, from the camera ray instead of rendering the whole scene. None if it can't tell.
+
+        Until the node's ray caster is ready, meshes with up to scan_limit faces get every face checked instead."""
+        camera = self._controller.getScene().getActiveCamera()
+        geometry = self._get_node_geometry(node)
+        if camera is None or geometry is None:
+            return None
+        vertices, indices, transformation = geometry
+
+        ray = camera.getRay(event.x, event.y)
+        origin = ray.origin.getData()
+        direction = ray.direction.getData()
+        # Much cheaper to move the ray into the mesh's coordinates than the mesh into the world's
+        inverse = np.linalg.inv(transformation)
+        local_origin = inverse[:3, :3] @ origin + inverse[:3, 3]
+        local_direction = inverse[:3, :3] @ direction
+
+        ray_caster = self._get_ray_caster(node.getMeshData())
+        if ray_caster is not None:
+            distance = ray_caster.distance(local_origin, local_direction)
+        else:
+            self._prepare_ray_caster(node)
+            if indices.shape[0] > scan_limit:
+                log("d", "_analytic_pick has no ray caster for %s yet and it's too big to scan", node.getName())
+                return None
+            distance = TabGeometry.ray_mesh_distance(local_origin, local_direction, vertices, indices)
+        if distance is None:
+            log("d", "_analytic_pick missed %s, falling back to rendering", node.getName())
+            return None
+        hit = origin + direction * distance
+        return Vector(float(hit[0]), float(hit[1]), float(hit[2]))
+
+    def _get_ray_caster(self, mesh_data: MeshData) -> TabGeometry.MeshRayCaster:
+        """The ray caster for a mesh if it's been built, otherwise None."""
+        if mesh_data is None:
+            return None
+        cached = self._ray_casters.get(id(mesh_data))
+        if cached is None:
+            return None
+        mesh_ref, ray_caster = cached
+        if mesh_ref() is not mesh_data:
+            # A different mesh that happens to have the same id as a dead one
+            del self._ray_casters[id(mesh_data)]
+            return None
+        self._ray_casters.move_to_end(id(mesh_data))
+        return ray_caster
+
+    def _prepare_ray_caster(self, node: CuraSceneNode) -> None:
+        """Start building a ray caster for a node in the background, unless there's one already or on the way."""
+        mesh_data = node.getMeshData()
+        if mesh_data is None or self._get_ray_caster(mesh_data) is not None or id(mesh_data) in self._ray_caster_jobs:
+            return
+        geometry = self._get_node_geometry(node)
+        if geometry is None:
+            return
+        log("d", "_prepare_ray_caster building a ray caster for %s", node.getName())
+        job = RayCasterJob(mesh_data, geometry[0], geometry[1])
+        self._ray_caster_jobs[job.key] = job
+        job.finished.connect(self._onRayCasterJobFinished)
+        job.start()
+
+    def _prepare_selected_ray_casters(self) -> None:
+        """Get ray casters ready for whatever is likely to be clicked on next."""
+        for node in self._getAllSelectedNodes():
+            if self._tab_registry.isTab(node) or not node.callDecoration("isSliceable"):
+                continue
+            self._prepare_ray_caster(node)
+
+    def _onRayCasterJobFinished(self, job: RayCasterJob) -> None:
+        if self._ray_caster_jobs.get(job.key) is job:
+            del self._ray_caster_jobs[job.key]
+        mesh_data = job.mesh_ref()
+        ray_caster = job.getResult()
+        if mesh_data is None or ray_caster is None:
+            return
+        self._ray_casters[job.key] = (job.mesh_ref, ray_caster)
+        self._ray_casters.move_to_end(job.key)
+        # Throw out the least recently used until they fit, but always keep the newest
+        total_faces = sum(cached[1].faces.shape[0] for cached in self._ray_casters.values())
+        while total_faces > RAY_CASTER_CACHE_FACES and len(self._ray_casters) > 1:
+            _, (_, evicted) = self._ray_casters.popitem(last=False)
+            total_faces -= evicted.faces.shape[0]
+
+    def _pick_and_place(self, picked_position: Vector = None):
         log("d", "_picking_pass is just getting started")
         picked_node = self._last_picked_node
         event = self._last_event
-        log("d", f"_picking_pass working on picked_node {picked_node}")
+        log("d", "_picking_pass working on picked_node %s", picked_node)
 
 
         node_world_transform = picked_node.getWorldTransformation()
         if node_world_transform:
             node_position = node_world_transform.getTranslation()
-            log("d", f"picked_node world position = {node_position}")
+            log("d", "picked_node world position = %s", node_position)
         else:
             log("d", "picked_node has no world transformation")
 
@@ -241,9 +795,9 @@ class TabAnitWarpingReborn(Tool):
         if node_stack:
             if node_stack.getProperty("support_mesh", "value"):
                 self._removeSupportMesh(picked_node)
-                log("d", f"_picking_pass just found that picked_node was support and removed it")
+                log("d", "_picking_pass just found that picked_node was support and removed it")
                 # Show previously hidden Messages
-                log("d", f"_picking_pass about to run _show_messages while _hidden_messages is {self._hidden_messages}")
+                log("d", "_picking_pass about to run _show_messages while _hidden_messages is %s", self._hidden_messages)
                 try:
                     self._show_messages()
                 except Exception as e:
@@ -251,30 +805,33 @@ class TabAnitWarpingReborn(Tool):
                 return
             if node_stack.getProperty("anti_overhang_mesh", "value") or node_stack.getProperty("infill_mesh", "value") or node_stack.getProperty("support_mesh", "value"):
                 # Only "normal" meshes can have support_mesh added to them
-                log("d", f"_picking_pass found that picked_node {picked_node} is the wrong kind of mesh")
+                log("d", "_picking_pass found that picked_node %s is the wrong kind of mesh", picked_node)
                 # Show previously hidden Messages
-                log("d", f"_picking_pass about to run _show_messages while _hidden_messages is {self._hidden_messages}")
+                log("d", "_picking_pass about to run _show_messages while _hidden_messages is %s", self._hidden_messages)
                 try:
                     self._show_messages()
                 except Exception as e:
                     log("e", f"_show_messages raised {e}")
                 return
 
-        # Create a pass for picking a world-space location from the mouse location
-        active_camera = self._controller.getScene().getActiveCamera()
-        picking_pass = PickingPass(active_camera.getViewportWidth(), active_camera.getViewportHeight())
-        log("d", f"_picking_pass: active_camera.getViewportWidth() = {active_camera.getViewportWidth()} and active_camera.getViewportHeight = {active_camera.getViewportHeight()}")
-        picking_pass.render()
-
-        log("d", f"event.x = {event.x}, event.y = {event.y}")
-        picked_position = picking_pass.getPickedPosition(event.x, event.y)
+        if picked_position is None:
+            # Create a pass for picking a world-space location from the mouse location
+            active_camera = self._controller.getScene().getActiveCamera()
+            picking_pass = PickingPass(active_camera.getViewportWidth(), active_camera.getViewportHeight())
+            log("d", "_picking_pass: active_camera.getViewportWidth() = %s and active_camera.getViewportHeight = %s", active_camera.getViewportWidth(), active_camera.getViewportHeight())
+            with self._perf_stats.span("pick.render"):
+                picking_pass.render()
+                log("d", "event.x = %s, event.y = %s", event.x, event.y)
+                picked_position = picking_pass.getPickedPosition(event.x, event.y)
         #self._notification_add(repr(picked_position), 5)
 
-        log("dd", f"repr(picked_position) = {repr(picked_position)}")
-        if not self._check_valid_tab_placement(picked_position):
-            log("d", f"picked_position {picked_position} deemed invalid")
+        log("dd", "picked_position = %r", picked_position)
+        with self._perf_stats.span("pick.validate"):
+            placement_valid = self._check_valid_tab_placement(picked_position, picked_node)
+        if not placement_valid:
+            log("d", "picked_position %s deemed invalid", picked_position)
             # Show previously hidden Messages
-            log("d", f"_picking_pass about to run _show_messages while _hidden_toasts is {self._hidden_messages}")
+            log("d", "_picking_pass about to run _show_messages while _hidden_toasts is %s", self._hidden_messages)
             try:
                 self._show_messages()
             except Exception as e:
@@ -285,14 +842,110 @@ class TabAnitWarpingReborn(Tool):
         self._createSupportMesh(picked_node, picked_position)
 
         # Show previously hidden Messages
-        log("d", f"_picking_pass about to run _show_messages while _hidden_toasts is {self._hidden_messages}")
+        log("d", "_picking_pass about to run _show_messages while _hidden_toasts is %s", self._hidden_messages)
         try:
             self._show_messages()
         except Exception as e:
             log("e", f"_show_messages raised {e}")
 
+    def _start_paint_stroke(self, node: CuraSceneNode, event) -> bool:
+        """Start painting tabs around node, with the first one where the mouse went down. False if the click missed it."""
+        with self._perf_stats.span("pick.analytic"):
+            position = self._analytic_pick(node, event)
+        if position is None:
+            return False
+
+        global_stack = CuraApplication.getInstance().getGlobalContainerStack()
+        half_width = float(global_stack.getProperty("machine_width", "value")) / 2 - self._tab_size / 2
+        half_depth = float(global_stack.getProperty("machine_depth", "value")) / 2 - self._tab_size / 2
+        # Get any building out of the way now rather than on the first tab
+        with self._perf_stats.span("paint.start"):
+            self._get_placement_hash()
+        self._paint_stroke = PaintStroke(node, TabGeometry.TabSpatialHash(self._tab_size), (-half_width, half_width, -half_depth, half_depth))
+        # One node to hold the previews. Adding it to the root is a change everything listening to the scene reacts to,
+        # previews added under it only look like a change to something that isn't sliceable, which they ignore.
+        self._paint_stroke.previews = SceneNode(name = TAB_PREVIEW_NODE_NAME)
+        self._paint_stroke.previews.setSelectable(False)
+        self._paint_stroke.previews.setCalculateBoundingBox(False)
+        self._paint_stroke.previews.setParent(self._controller.getScene().getRoot())
+        self._paint_stroke.last_mouse = (event.x, event.y)
+        self._paint_stroke.last_hit = (position.x, position.z)
+        self._paint_tab(position)
+        log("d", "_start_paint_stroke started painting on %s", node.getName())
+        return True
+
+    def _continue_paint_stroke(self, event) -> None:
+        """Follow the mouse along the node being painted, dropping a tab every tab width or so."""
+        stroke = self._paint_stroke
+        # Moves come in a lot faster than anything changes, don't bother with ones that didn't go anywhere
+        if stroke.last_mouse == (event.x, event.y):
+            return
+        stroke.last_mouse = (event.x, event.y)
+
+        with self._perf_stats.span("paint.move"):
+            position = self._analytic_pick(stroke.node, event, PAINT_SCAN_MAX_FACES)
+            if position is None:
+                # Off the edge of the object, pick up where it comes back on
+                return
+            if stroke.last_hit is not None:
+                stroke.travelled += math.hypot(position.x - stroke.last_hit[0], position.z - stroke.last_hit[1])
+            stroke.last_hit = (position.x, position.z)
+            if stroke.travelled >= self._tab_size:
+                self._paint_tab(position)
+
+    def _paint_tab(self, position: Vector) -> None:
+        """Put a preview tab at position if one can go there."""
+        stroke = self._paint_stroke
+        left, right, front, rear = stroke.plate_edges
+        if not (left <= position.x <= right and front <= position.z <= rear):
+            stroke.problem = catalog.i18nc("tab_on_plate_edge", "A tab can't be that close to edge of the build plate. You should move your object in a bit.")
+            return
+        # Painted tabs don't overlap each other either, so they need a whole tab width between them
+        overlap = self._check_tab_overlap(self._get_placement_hash(), stroke.node, position, self._tab_size)
+        if not overlap and stroke.painted_hash.tab_near(position.x, position.z, self._tab_size):
+            overlap = "tab"
+        if overlap == "tab":
+            stroke.problem = catalog.i18nc("tab_overlaps_tab", "There's already a tab there.")
+            return
+        if overlap == "object":
+            stroke.problem = catalog.i18nc("tab_overlaps_object", "A tab there would run into another object.")
+            return
+
+        stroke.painted_hash.add_tab(position.x, position.z)
+        stroke.positions.append(position)
+        stroke.travelled = 0.0
+
+        # Just something to look at, so it shares the tab mesh and stays out of the undo stack and the slice.
+        # Everything gets set before it's parented so adding it is the only change the scene hears about.
+        preview = SceneNode(name = TAB_PREVIEW_NODE_NAME)
+        preview.setMeshData(self._get_tab_mesh_data(*self._tab_shape(self._get_stack_snapshot())))
+        preview.setSelectable(False)
+        preview.setCalculateBoundingBox(False)
+        preview.setPosition(Vector(position.x, 0, position.z))
+        preview.setParent(stroke.previews)
+
+    def _finish_paint_stroke(self) -> None:
+        """Swap the previews for real tabs, all in one undo step."""
+        stroke = self._paint_stroke
+        self._cancel_paint_stroke()
+        log("d", "_finish_paint_stroke painted %s tabs on %s", len(stroke.positions), stroke.node.getName())
+        if stroke.positions:
+            self._create_tabs([(stroke.node, position) for position in stroke.positions])
+        elif stroke.problem:
+            self._notification_add(stroke.problem, 5)
+        self._perf_stats_changed()
+
+    def _cancel_paint_stroke(self) -> None:
+        """Stop painting and get rid of the previews without adding anything."""
+        stroke = self._paint_stroke
+        self._paint_stroke = None
+        if stroke is None:
+            return
+        if stroke.previews is not None:
+            stroke.previews.setParent(None)
+
     def _hide_messages(self):
-        log("d", f"_hide_messages is running with an _application.getVisibleMessages() of {self._application.getVisibleMessages()}")
+        log("d", "_hide_messages is running with an _application.getVisibleMessages() of %s", self._application.getVisibleMessages())
         message_count = len(self._application.getVisibleMessages())
         if message_count == 0:
             self._are_messages_hidden = False
@@ -301,7 +954,7 @@ class TabAnitWarpingReborn(Tool):
         self._are_messages_hidden = True
         self._notification_add("<font color='red'>Do not move the camera until the click location is recorded.</font>", 1)
         self._hidden_messages = list(self._application.getVisibleMessages())
-        log("d", f"_hide_messages just set _hidden_messages to {self._hidden_messages}")
+        log("d", "_hide_messages just set _hidden_messages to %s", self._hidden_messages)
         for message in self._hidden_messages:
             message.hide()
 
@@ -317,65 +970,177 @@ class TabAnitWarpingReborn(Tool):
         self._hidden_messages = []
 
     def _notification_add(self, text: str, lifetime: float) -> None:
-        notification = Notification(text, lifetime, self._notification_next_id)
-        self._notifications.append(notification)
-        self._notification_next_id += 1
+        expires = time.monotonic() + lifetime
+        notification = self._notifications.get(text)
+        if notification is not None:
+            # Already up, so count it instead of showing it twice and keep it up for at least as long as the new one would be
+            notification.count += 1
+            if expires <= notification.expires:
+                self._notifications_set_property()
+                return
+            notification.lifetime = lifetime
+            notification.expires = expires
+        else:
+            notification = Notification(text, lifetime, self._notification_next_id, expires)
+            self._notification_next_id += 1
+            self._notifications[text] = notification
+        heapq.heappush(self._notification_expiry, (expires, notification.id, text))
+        self._schedule_notification_expiry()
         self._notifications_set_property()
-        QTimer.singleShot(int(lifetime * 1000), lambda: self._notification_remove(notification))
 
-    def _notification_remove(self, notification: Notification) -> None:
-        if notification in self._notifications:
-            self._notifications.remove(notification)
+    def _schedule_notification_expiry(self) -> None:
+        """Make sure the timer goes off when the next notification is due to go, and no later."""
+        if not self._notification_expiry:
+            return
+        due = self._notification_expiry[0][0]
+        if self._notification_timer.isActive() and self._notification_timer_due <= due:
+            return
+        self._notification_timer_due = due
+        self._notification_timer.start(max(0, math.ceil((due - time.monotonic()) * 1000)))
+
+    def _expire_notifications(self) -> None:
+        """Get rid of every notification whose time is up."""
+        self._notification_timer_due = math.inf
+        now = time.monotonic()
+        removed = False
+        while self._notification_expiry and self._notification_expiry[0][0] <= now:
+            expires, notification_id, text = heapq.heappop(self._notification_expiry)
+            notification = self._notifications.get(text)
+            if notification is None or notification.id != notification_id or notification.expires != expires:
+                # It was pushed back, or gone and shown again since
+                continue
+            del self._notifications[text]
+            removed = True
+        if removed:
             self._notifications_set_property()
-        else:
-            log("d", f"_notification_remove could not find notification with text {notification.text} and ID {notification.id}")
+        self._schedule_notification_expiry()
+
+    def _perf_stats_changed(self) -> None:
+        """Let the panel know there are new timings, if it's showing them."""
+        if self._show_timings:
+            self.propertyChanged.emit()
 
     def _notifications_set_property(self) -> None:
-        self._notifications_string = "<br><br>".join(notification.text for notification in self._notifications)
+        """The notifications changed. The panel finds out on the next update."""
+        if not self._notification_update_timer.isActive():
+            self._notification_update_timer.start()
+
+    def _update_notifications_property(self) -> None:
+        self._notifications_string = "<br><br>".join(
+            notification.text if notification.count == 1 else f"{notification.text} (x{notification.count})"
+            for notification in self._notifications.values())
         self.propertyChanged.emit()
 
     def _createSupportMesh(self, parent: CuraSceneNode, position: Vector):
-        node = CuraSceneNode()
-
-        node.setName("AdhesionTab")
-
-        node.setSelectable(True)
+        """Create a single tab. Goes through the batch path so there's only one way a tab gets made."""
+        self._create_tabs([(parent, position)])
 
-        # long=Support Height
-        tab_start_y=position.y
+    def _create_tabs(self, placements: list[tuple[CuraSceneNode, Vector]], merge: bool = False,
+                     auto_placement: AutoTabPlacement = None, scene_op: GroupedOperation = None) -> list[CuraSceneNode]:
+        """Create a tab for every (parent, position) pair as one undo step with one scene change.
 
-        global_stack = CuraApplication.getInstance().getGlobalContainerStack()
-
-        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
-
-        # Reasonable defaults for the "standard" 0.4mm nozzle
-        layer_height_0: float = 0.3
-        layer_height: float = 0.2
-        line_width: float = 0.4
+        With merge, all the tabs for each parent become a single node instead of one node each.
+        auto_placement is how they were placed, if it was automatic. Pass in scene_op to add the tabs to
+        a bigger operation instead, in which case pushing it (and the scene change) is up to you."""
+        if not placements:
+            return []
 
-        try:
-            layer_height_0 = float(extruder_stack.getProperty("layer_height_0", "value"))
-            layer_height = float(extruder_stack.getProperty("layer_height", "value"))
-            line_width = float(extruder_stack.getProperty("line_width", "value"))
-        except ValueError as e:
-            log("e", f"Error encountered getting properties from the extruder_stack: {e}")
+        with self._perf_stats.span("tabs.total"):
+            global_stack = CuraApplication.getInstance().getGlobalContainerStack()
+            with self._perf_stats.span("tabs.stack"):
+                snapshot = self._get_stack_snapshot()
+
+            if self._as_dish:
+                self._any_as_dish = True
+
+            # Every tab with the same settings is the same shape, so only build it once and move it into place
+            tab_shape = self._tab_shape(snapshot)
+
+            active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
+            scene_root = self._controller.getScene().getRoot()
+
+            # (parent, where the node goes, its mesh, where each tab is relative to the node)
+            node_specs: list[tuple[CuraSceneNode, Vector, MeshData, np.ndarray]] = []
+            with self._perf_stats.span("tabs.mesh"):
+                if merge:
+                    groups: dict[int, tuple[CuraSceneNode, list[Vector]]] = {}
+                    for parent, position in placements:
+                        groups.setdefault(id(parent), (parent, []))[1].append(position)
+                    for parent, positions in groups.values():
+                        footprints = np.array([[position.x, position.z] for position in positions], dtype=np.float64)
+                        centre = footprints.mean(axis=0)
+                        footprints -= centre
+                        mesh_data = self._fuse_tab_meshes(*self._get_tab_template(*tab_shape), footprints)
+                        node_specs.append((parent, Vector(float(centre[0]), 0, float(centre[1])), mesh_data, footprints))
+                else:
+                    shared_mesh_data = self._get_tab_mesh_data(*tab_shape)
+                    for parent, position in placements:
+                        node_specs.append((parent, position, shared_mesh_data, np.zeros((1, 2))))
+
+            push_operation = scene_op is None
+            if push_operation:
+                scene_op = GroupedOperation()
+            nodes: list[CuraSceneNode] = []
+            for parent, position, mesh_data, footprints in node_specs:
+                node = self._create_tab_node(mesh_data, active_build_plate, footprints, auto_placement)
+                # The template mesh starts at y = 0 so it always goes on the build plate, wherever on the model was clicked
+                position = Vector(position.x, 0, position.z)
+                # First add node to the scene at the correct position/scale, before parenting, so the support mesh does not get scaled with the parent
+                scene_op.addOperation(AddSceneNodeOperation(node, scene_root))
+                scene_op.addOperation(SetParentOperation(node, parent))
+                scene_op.addOperation(TranslateOperation(node, position, set_position = True))
+                nodes.append(node)
+
+            # Only needs doing once no matter how many tabs there are
+            self._apply_tab_global_settings(global_stack, snapshot)
+
+            if not push_operation:
+                return nodes
+            with self._perf_stats.span("tabs.scene"):
+                scene_op.push()
+                CuraApplication.getInstance().getController().getScene().sceneChanged.emit(nodes[-1])
+        self.propertyChanged.emit()
+        log("d", "_create_tabs created %s tabs in one operation", len(nodes))
+        return nodes
+
+    def _tab_shape(self, snapshot: TabStackSnapshot) -> tuple:
+        """Everything that changes the shape of a tab with the current settings, as arguments for _get_tab_template."""
+        tab_total_height = (snapshot.layer_height_0 * 1.2) + (snapshot.layer_height * (self._layer_count -1))
+        tab_line_width = snapshot.line_width * 1.2
+        # Small tabs don't need as many sides as big ones to print round. Dishes flare out at 45° so their top is the widest part.
+        widest_radius = self._tab_size / 2 + (tab_total_height * 3 if self._as_dish else 0)
+        segments = TabGeometry.tab_segments(widest_radius, snapshot.line_width, TAB_CHORD_ERROR, TAB_MIN_SEGMENTS, TAB_MAX_SEGMENTS)
+        return (self._as_dish, self._tab_size, segments, tab_total_height, tab_line_width, self._layer_count)
+
+    @staticmethod
+    def _fuse_tab_meshes(vertices: np.ndarray, normals: np.ndarray, indices: np.ndarray, footprints: np.ndarray) -> MeshData:
+        """One mesh with a copy of the tab template at each footprint (X/Z offset).
+
+        The copies overlap rather than being joined properly. CuraEngine unions overlapping volumes in a mesh
+        (and the node turns that on for itself) so it slices the same as separate tabs."""
+        tab_count = footprints.shape[0]
+        offsets = np.zeros((tab_count, 1, 3), dtype=np.float32)
+        offsets[:, 0, 0] = footprints[:, 0]
+        offsets[:, 0, 2] = footprints[:, 1]
+        fused_vertices = (vertices[np.newaxis, :, :] + offsets).reshape(-1, 3)
+        fused_normals = np.tile(normals, (tab_count, 1))
+        fused_indices = (indices[np.newaxis, :, :] + (np.arange(tab_count, dtype=np.int32) * vertices.shape[0])[:, np.newaxis, np.newaxis]).reshape(-1, 3)
+        return MeshData(vertices=fused_vertices, normals=fused_normals, indices=fused_indices)
+
+    def _create_tab_node(self, mesh_data: MeshData, build_plate: int, footprints: np.ndarray = None, auto_placement: AutoTabPlacement = None) -> CuraSceneNode:
+        """Make a tab node with its support mesh settings, ready to be added to the scene."""
+        node = CuraSceneNode()
 
-        tab_total_height = (layer_height_0 * 1.2) + (layer_height * (self._layer_count -1))
-        tab_line_width = line_width * 1.2
+        node.setName(TAB_NODE_NAME)
 
-        if self._as_dish:
-             # Capsule creation Diameter , Increment angle 10°, length, layer_height_0*1.2 , line_width
-            mesh = self._create_dish(self._tab_size, 10, tab_start_y, tab_total_height, tab_line_width)
-            self._any_as_dish = True
-        else:
-            # Cylinder creation Diameter , Increment angle 10°, length, layer_height_0*1.2
-            mesh = self._createCylinder(self._tab_size, 10, tab_start_y, tab_total_height)
+        node.setSelectable(True)
 
-        node.setMeshData(mesh.build())
+        node.setMeshData(mesh_data)
 
-        active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
-        node.addDecorator(BuildPlateDecorator(active_build_plate))
+        node.addDecorator(BuildPlateDecorator(build_plate))
         node.addDecorator(SliceableObjectDecorator())
+        node.addDecorator(TabDecorator(footprints, auto_placement))
+        _save_tab_metadata(node, footprints, auto_placement)
 
         stack = node.callDecoration("getStack") # created by SettingOverrideDecorator that is automatically added to CuraSceneNode
         settings = stack.getTop()
@@ -393,10 +1158,29 @@ class TabAnitWarpingReborn(Tool):
         new_instance.resetState()  # Ensure that the state is not seen as a user state.
         settings.addInstance(new_instance)
 
+        # Define support_xy_distance
+        definition = stack.getSettingDefinition("support_xy_distance")
+        new_instance = SettingInstance(definition, settings)
+        new_instance.setProperty("value", self._xy_distance)
+        # new_instance.resetState()  # Ensure that the state is not seen as a user state.
+        settings.addInstance(new_instance)
+
+        if footprints is not None and footprints.shape[0] > 1:
+            # Merged tabs are overlapping copies in one mesh, which need unioning to slice properly
+            definition = stack.getSettingDefinition("meshfix_union_all")
+            new_instance = SettingInstance(definition, settings)
+            new_instance.setProperty("value", True)
+            new_instance.resetState()  # Ensure that the state is not seen as a user state.
+            settings.addInstance(new_instance)
+
+        return node
+
+    def _apply_tab_global_settings(self, global_stack, snapshot: TabStackSnapshot) -> None:
+        """Change the global settings tabs need to print properly, letting the user know about it."""
         # Define support_type
         if self._any_as_dish or self._as_dish:
             support_type_key="support_type"
-            support_placement = global_stack.getProperty(support_type_key, "value")
+            support_placement = snapshot.support_type
             #log("d", f"BEFORE: global stack support_type = {support_placement}")
             if support_placement == "buildplate":
                 message_string = catalog.i18nc("@info:support_placement_modified", "Support placement has been set to Everywhere to ensure dish tabs work correctly.")
@@ -404,18 +1188,11 @@ class TabAnitWarpingReborn(Tool):
                 global_stack.setProperty(support_type_key, "value", "everywhere")
                 #log("d", f"AFTER: global stack support_type = {global_stack.getProperty(support_type_key, 'value')}")
 
-        # Define support_xy_distance
-        definition = stack.getSettingDefinition("support_xy_distance")
-        new_instance = SettingInstance(definition, settings)
-        new_instance.setProperty("value", self._xy_distance)
-        # new_instance.resetState()  # Ensure that the state is not seen as a user state.
-        settings.addInstance(new_instance)
-
         # Fix some settings in Cura to get a better result
         #extruder = global_container_stack.extruderList[int(id_ex)]
 
         support_xy_key="support_xy_distance"
-        stack_xy_distance = global_stack.getProperty(support_xy_key, "value")
+        stack_xy_distance = snapshot.support_xy_distance
         #log("d", f"BEFORE: global stack {support_xy_key} = {stack_xy_distance}")
         if self._xy_distance != stack_xy_distance:
             global_stack.setProperty(support_xy_key, "value", self._xy_distance)
@@ -431,7 +1208,7 @@ class TabAnitWarpingReborn(Tool):
         # Support infill (more than 1 layer needs to be solid)
         if self._layer_count > 1:
             support_infill_key="support_infill_rate"
-            support_infill = float(extruder_stack.getProperty(support_infill_key, "value"))
+            support_infill = snapshot.support_infill_rate
             #log("d", f"BEFORE: global stack support_infill = {support_infill}")
             if support_infill < 100.0:
                 message_string = catalog.i18nc("@info:support_infill_modified", "Support density has been set to 100% to ensure tabs over 1 layer high are solid.")
@@ -439,24 +1216,67 @@ class TabAnitWarpingReborn(Tool):
                 global_stack.setProperty(support_infill_key, "value", 100.0)
                 #log("d", f"AFTER: global stack support_infill = {extruder_stack.getProperty(support_infill_key, 'value')}")
 
+    def _get_stack_snapshot(self) -> TabStackSnapshot:
+        """Get the settings tabs need, only going to the stacks if they've changed since last time."""
+        if self._stack_snapshot is None:
+            self._stack_snapshot = self._read_stack_snapshot()
+        return self._stack_snapshot
 
-        scene_op = GroupedOperation()
-        # First add node to the scene at the correct position/scale, before parenting, so the support mesh does not get scaled with the parent
-        scene_op.addOperation(AddSceneNodeOperation(node, self._controller.getScene().getRoot()))
-        scene_op.addOperation(SetParentOperation(node, parent))
-        scene_op.addOperation(TranslateOperation(node, position, set_position = True))
-        scene_op.push()
-        self._scene_tabs.append(node)
-        self.propertyChanged.emit()
+    def _read_stack_snapshot(self) -> TabStackSnapshot:
+        global_stack = CuraApplication.getInstance().getGlobalContainerStack()
+
+        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
+
+        # Reasonable defaults for the "standard" 0.4mm nozzle
+        snapshot = TabStackSnapshot(
+            layer_height_0 = 0.3,
+            layer_height = 0.2,
+            line_width = 0.4,
+            support_type = global_stack.getProperty("support_type", "value"),
+            support_xy_distance = 0.7,
+            support_infill_rate = 0.0
+        )
+
+        try:
+            snapshot.layer_height_0 = float(extruder_stack.getProperty("layer_height_0", "value"))
+            snapshot.layer_height = float(extruder_stack.getProperty("layer_height", "value"))
+            snapshot.line_width = float(extruder_stack.getProperty("line_width", "value"))
+            snapshot.support_xy_distance = float(global_stack.getProperty("support_xy_distance", "value"))
+            snapshot.support_infill_rate = float(extruder_stack.getProperty("support_infill_rate", "value"))
+        except (TypeError, ValueError) as e:
+            log("e", f"Error encountered getting properties from the extruder_stack: {e}")
+
+        log("d", "_read_stack_snapshot read %s", snapshot)
+        return snapshot
+
+    def _invalidate_stack_snapshot(self, *args) -> None:
+        """Connected to stack signals. Whatever changed, the snapshot needs reading again."""
+        self._stack_snapshot = None
+
+    def _onGlobalContainerStackChanged(self) -> None:
+        """Watch the new global stack and its extruders for changes instead of the old ones."""
+        self._invalidate_stack_snapshot()
+
+        for stack in self._watched_stacks:
+            stack.propertyChanged.disconnect(self._invalidate_stack_snapshot)
+            stack.containersChanged.disconnect(self._invalidate_stack_snapshot)
+        self._watched_stacks = []
+
+        global_stack = CuraApplication.getInstance().getGlobalContainerStack()
+        if not global_stack:
+            return
 
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+        self._watched_stacks = [global_stack] + list(global_stack.extruderList)
+        for stack in self._watched_stacks:
+            stack.propertyChanged.connect(self._invalidate_stack_snapshot)
+            stack.containersChanged.connect(self._invalidate_stack_snapshot)
 
-    def _check_valid_tab_placement(self, picked_position) -> bool:
+    def _check_valid_tab_placement(self, picked_position, parent: CuraSceneNode = None) -> bool:
         # Check to see if Cura picked a spot off the build plate
         global_stack = CuraApplication.getInstance().getGlobalContainerStack()
         machine_width = float(global_stack.getProperty("machine_width", "value"))
         machine_depth = float(global_stack.getProperty("machine_depth", "value"))
-        log("d", f"machine width = {machine_width}, depth = {machine_depth}")
+        log("d", "machine width = %s, depth = %s", machine_width, machine_depth)
         if (picked_position.x < -(machine_width / 2)
             or picked_position.x > (machine_width / 2)
             or picked_position.z < -(machine_depth / 2)
@@ -469,7 +1289,7 @@ class TabAnitWarpingReborn(Tool):
         right_edge: float = (machine_width / 2) - (self._tab_size / 2)
         front_edge: float = (-machine_depth / 2) + (self._tab_size / 2)
         rear_edge: float = (machine_depth / 2) - (self._tab_size / 2)
-        log("d", f"left_edge = {left_edge}, right_edge = {right_edge}, front_edge = {front_edge}, rear_edge = {rear_edge}")
+        log("d", "left_edge = %s, right_edge = %s, front_edge = %s, rear_edge = %s", left_edge, right_edge, front_edge, rear_edge)
         if(
             picked_position.x < left_edge
             or picked_position.x > right_edge
@@ -479,21 +1299,100 @@ class TabAnitWarpingReborn(Tool):
             self._notification_add(catalog.i18nc("tab_on_plate_edge", "A tab can't be that close to edge of the build plate. You should move your object in a bit."), 7.5)
             return False
 
-        #TODO: Use SceneNode.collidesWithBbox()
+        if parent is not None:
+            # Half a tab away is close enough to count as clicking the same spot twice
+            overlap = self._check_tab_overlap(self._get_placement_hash(), parent, picked_position, self._tab_size * 0.5)
+            if overlap == "tab":
+                self._notification_add(catalog.i18nc("tab_overlaps_tab", "There's already a tab there."), 5)
+                return False
+            if overlap == "object":
+                self._notification_add(catalog.i18nc("tab_overlaps_object", "A tab there would run into another object."), 5)
+                return False
+
         return True
 
+    def _get_placement_hash(self) -> TabGeometry.TabSpatialHash:
+        """A spatial hash of every tab and every object's base for overlap checks.
+
+        Kept between checks and only the nodes that changed since last time get redone. Objects with base outlines cached
+        use those, anything else uses Cura's convex hull."""
+        # Which outlines count as the base (and how big the cells are) depends on the settings, so those start it over
+        heights = self._base_section_heights()
+        if (self._placement_hash is None or self._placement_hash.cell_size != max(self._tab_size, 0.1)
+            or self._placement_heights != heights):
+            with self._perf_stats.span("placement.build"):
+                self._placement_heights = heights
+                self._placement_hash = TabGeometry.TabSpatialHash(self._tab_size)
+                self._placement_dirty.clear()
+                for tab in self._tab_registry.getTabs():
+                    self._update_placement_tab(tab)
+                for model in self._tab_registry.getModels():
+                    self._placement_hash.set_outlines(id(model), self._placement_outlines(model))
+            return self._placement_hash
+
+        while self._placement_dirty:
+            dirty = list(self._placement_dirty)
+            self._placement_dirty.clear()
+            for node in dirty:
+                self._update_placement_node(node)
+        return self._placement_hash
+
+    def _update_placement_node(self, node: SceneNode) -> None:
+        """Redo a node's entries in the placement hash, and those of anything under it (which moves when it does)."""
+        if self._tab_registry.isTab(node):
+            self._update_placement_tab(node)
+            return
+        if self._tab_registry.isModel(node):
+            self._placement_hash.set_outlines(id(node), self._placement_outlines(node))
+        for child in node.getChildren():
+            self._update_placement_node(child)
+
+    def _update_placement_tab(self, tab: SceneNode) -> None:
+        position = tab.getWorldPosition()
+        self._placement_hash.set_tabs(id(tab), [(position.x + x, position.z + z) for x, z in tab.callDecoration("getTabFootprints")])
+
+    def _placement_outlines(self, model: SceneNode) -> list[np.ndarray]:
+        """What counts as an object's base for overlap checks: its base outlines if they've been worked out, otherwise its convex hull."""
+        cached = self._get_cached_base_outlines(model, self._placement_heights)
+        if cached:
+            return [shape.getPoints() for shape in cached]
+        hull_polygon: Polygon = model.callDecoration("getConvexHull")
+        if hull_polygon is None or not hull_polygon.isValid():
+            return []
+        return [hull_polygon.getPoints()]
+
+    def _onPlacementNodeChanged(self, node: SceneNode) -> None:
+        if self._placement_hash is not None:
+            self._placement_dirty.add(node)
+
+    def _onPlacementNodeForgotten(self, node: SceneNode) -> None:
+        if self._placement_hash is not None:
+            self._placement_hash.remove_tabs(id(node))
+            self._placement_hash.remove_outlines(id(node))
+            self._placement_dirty.discard(node)
+
+    def _check_tab_overlap(self, placement_hash: TabGeometry.TabSpatialHash, parent: CuraSceneNode, position: Vector, min_distance: float,
+                           ignore_tabs: set[int] = ()) -> str:
+        """Why a tab can't go somewhere because of what's already there, or an empty string if it can. ignore_tabs are ids of tabs to not count."""
+        if placement_hash.tab_near(position.x, position.z, min_distance, ignore_tabs):
+            return "tab"
+        if placement_hash.outline_hit(position.x, position.z, self._tab_size / 2, id(parent)):
+            return "object"
+        return ""
+
     def _removeSupportMesh(self, node: CuraSceneNode):
         parent = node.getParent()
         if parent == self._controller.getScene().getRoot():
             parent = None
 
-        op = RemoveSceneNodeOperation(node)
-        op.push()
+        with self._perf_stats.span("remove.scene"):
+            op = RemoveSceneNodeOperation(node)
+            op.push()
 
-        if parent and not Selection.isSelected(parent):
-            Selection.add(parent)
+            if parent and not Selection.isSelected(parent):
+                Selection.add(parent)
 
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+            CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
 
     def _updateEnabled(self):
         """Run when global container stack changes to make sure settings we need are still applied"""
@@ -503,18 +1402,22 @@ class TabAnitWarpingReborn(Tool):
         if global_container_stack:
             # Check if any support meshes (tabs) exist in the scene.
             nodes_list = self._getAllSelectedNodes()
-            if not nodes_list:
-                nodes_list = DepthFirstIterator(self._application.getController().getScene().getRoot())
-
-            for node in nodes_list:
-                if node.callDecoration("isSliceable"):
-                    node_stack = node.callDecoration("getStack")
-                    if node_stack and node_stack.getProperty("support_mesh", "value"):
-                        plugin_enabled = True #Enable plugin if support meshes exist.
-                        if not global_container_stack.getProperty("support_mesh", "enabled"):
-                            global_container_stack.setProperty("support_mesh", "enabled", True)
-                            self._notification_add(catalog.i18nc("@info:label", "Support was re-enabled because tabs are present in the scene."), 5)
-                        break
+            if nodes_list:
+                tabs_exist = False
+                for node in nodes_list:
+                    if node.callDecoration("isSliceable"):
+                        node_stack = node.callDecoration("getStack")
+                        if node_stack and node_stack.getProperty("support_mesh", "value"):
+                            tabs_exist = True
+                            break
+            else:
+                tabs_exist = self._tab_registry.hasTabs()
+
+            if tabs_exist:
+                plugin_enabled = True #Enable plugin if support meshes exist.
+                if not global_container_stack.getProperty("support_mesh", "enabled"):
+                    global_container_stack.setProperty("support_mesh", "enabled", True)
+                    self._notification_add(catalog.i18nc("@info:label", "Support was re-enabled because tabs are present in the scene."), 5)
             else:
                 plugin_enabled = global_container_stack.getProperty("support_mesh", "enabled") #Use global setting, when no support meshes exist.
 
@@ -536,135 +1439,129 @@ class TabAnitWarpingReborn(Tool):
             self._skip_press = False
 
         self._had_selection = has_selection
-
-    # Capsule creation
-    def _create_dish(self, base_diameter: float, segments: int , height: float, top_height: float, line_width: float):
-        """Create a "dish" style adhesion tab"""
-        mesh = MeshBuilder()
-        # Per-vertex normals require duplication of vertices
-        base_radius = base_diameter / 2
-        # First layer length
-        max_y = -height + top_height
-        if self._layer_count >1 :
-            cap_height = -height + (top_height * 2)
+        if has_selection and self._controller.getActiveTool() is self:
+            self._prepare_selected_ray_casters()
+
+    @staticmethod
+    def _tab_template_key(as_dish: bool, diameter: float, segments: int, height: float, line_width: float, layer_count: int) -> tuple:
+        """Everything that changes the shape of a tab."""
+        return ("dish" if as_dish else "cylinder", round(diameter, 6), segments, round(height, 6), round(line_width, 6), layer_count)
+
+    def _get_tab_template(self, as_dish: bool, diameter: float, segments: int, height: float, line_width: float, layer_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the vertices, normals and indices for a tab sitting at the origin, only building it if it isn't cached."""
+        key = self._tab_template_key(as_dish, diameter, segments, height, line_width, layer_count)
+        template = self._tab_templates.get(key)
+        if template is not None:
+            self._tab_templates.move_to_end(key)
+            return template
+
+        log("d", "_get_tab_template building new template for %s", key)
+        if as_dish:
+            template = TabGeometry.create_dish_mesh(diameter, segments, height, line_width, layer_count)
         else:
-            cap_height = -height + (top_height * 3)
-        min_y = -height
-        segment_angle = int(360 / segments)
-        segment_radians = math.radians(segments)
-
-        cap_radius=math.tan(math.radians(45))*(top_height * 3)+base_radius
-        # Top inside radius
-        inner_radius_cap=cap_radius-(1.8*line_width)
-        # Top radius
-        inner_radius_base=base_radius-(1.8*line_width)
-
-        vertices = []
-        for i in range(0, segment_angle):
-            # Top
-            vertices.append([inner_radius_cap*math.cos(i*segment_radians), cap_height, inner_radius_cap*math.sin(i*segment_radians)])
-            vertices.append([cap_radius*math.cos((i+1)*segment_radians), cap_height, cap_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([cap_radius*math.cos(i*segment_radians), cap_height, cap_radius*math.sin(i*segment_radians)])
-
-            vertices.append([inner_radius_cap*math.cos((i+1)*segment_radians), cap_height, inner_radius_cap*math.sin((i+1)*segment_radians)])
-            vertices.append([cap_radius*math.cos((i+1)*segment_radians), cap_height, cap_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([inner_radius_cap*math.cos(i*segment_radians), cap_height, inner_radius_cap*math.sin(i*segment_radians)])
-
-            #Side 1a
-            vertices.append([cap_radius*math.cos(i*segment_radians), cap_height, cap_radius*math.sin(i*segment_radians)])
-            vertices.append([cap_radius*math.cos((i+1)*segment_radians), cap_height, cap_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-
-            #Side 1b
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([base_radius*math.cos(i*segment_radians), min_y, base_radius*math.sin(i*segment_radians)])
-            vertices.append([cap_radius*math.cos(i*segment_radians), cap_height, cap_radius*math.sin(i*segment_radians)])
-
-            #Side 2a
-            vertices.append([inner_radius_base*math.cos((i+1)*segment_radians), max_y, inner_radius_base*math.sin((i+1)*segment_radians)])
-            vertices.append([inner_radius_cap*math.cos((i+1)*segment_radians), cap_height, inner_radius_cap*math.sin((i+1)*segment_radians)])
-            vertices.append([inner_radius_cap*math.cos(i*segment_radians), cap_height, inner_radius_cap*math.sin(i*segment_radians)])
-
-            #Side 2b
-            vertices.append([inner_radius_cap*math.cos(i*segment_radians), cap_height, inner_radius_cap*math.sin(i*segment_radians)])
-            vertices.append([inner_radius_base*math.cos(i*segment_radians), max_y, inner_radius_base*math.sin(i*segment_radians)])
-            vertices.append([inner_radius_base*math.cos((i+1)*segment_radians), max_y, inner_radius_base*math.sin((i+1)*segment_radians)])
-
-            #Bottom Top
-            vertices.append([0, max_y, 0])
-            vertices.append([inner_radius_base*math.cos((i+1)*segment_radians), max_y, inner_radius_base*math.sin((i+1)*segment_radians)])
-            vertices.append([inner_radius_base*math.cos(i*segment_radians), max_y, inner_radius_base*math.sin(i*segment_radians)])
-
-            #Bottom
-            vertices.append([0, min_y, 0])
-            vertices.append([base_radius*math.cos(i*segment_radians), min_y, base_radius*math.sin(i*segment_radians)])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-
-        mesh.setVertices(np.asarray(vertices, dtype=np.float32))
-
-        indices = []
-        # for every angle increment 24 Vertices
-        total = segment_angle * 24
-        for i in range(0, total, 3):
-            indices.append([i, i+1, i+2])
-        mesh.setIndices(np.asarray(indices, dtype=np.int32))
-
-        mesh.calculateNormals()
-        return mesh
-
-    # Cylinder creation
-    def _createCylinder(self, base_diameter: float, segments: int, start_y: float, cylinder_height: float):
-        mesh = MeshBuilder()
-        # Per-vertex normals require duplication of vertices
-        base_radius = base_diameter / 2
-        # First layer length
-        max_y = -start_y + cylinder_height
-        min_y = -start_y
-        segment_angle = int(360 / segments)
-        segment_radians = math.radians(segments)
-
-        vertices = []
-        for i in range(0, segment_angle):
-            # Top
-            vertices.append([0, max_y, 0])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), max_y, base_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([base_radius*math.cos(i*segment_radians), max_y, base_radius*math.sin(i*segment_radians)])
-            #Side 1a
-            vertices.append([base_radius*math.cos(i*segment_radians), max_y, base_radius*math.sin(i*segment_radians)])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), max_y, base_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-            #Side 1b
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-            vertices.append([base_radius*math.cos(i*segment_radians), min_y, base_radius*math.sin(i*segment_radians)])
-            vertices.append([base_radius*math.cos(i*segment_radians), max_y, base_radius*math.sin(i*segment_radians)])
-            #Bottom
-            vertices.append([0, min_y, 0])
-            vertices.append([base_radius*math.cos(i*segment_radians), min_y, base_radius*math.sin(i*segment_radians)])
-            vertices.append([base_radius*math.cos((i+1)*segment_radians), min_y, base_radius*math.sin((i+1)*segment_radians)])
-
-        mesh.setVertices(np.asarray(vertices, dtype=np.float32))
-
-        indices = []
-        # for every angle increment 12 Vertices
-        total = segment_angle * 12
-        for i in range(0, total, 3):
-            indices.append([i, i+1, i+2])
-        mesh.setIndices(np.asarray(indices, dtype=np.int32))
-
-        mesh.calculateNormals()
-        return mesh
+            template = TabGeometry.create_cylinder_mesh(diameter, segments, height)
+
+        for array in template:
+            # Read only so MeshData can use them as they are instead of taking its own copy
+            array.setflags(write=False)
+        self._tab_templates[key] = template
+        if len(self._tab_templates) > TAB_TEMPLATE_CACHE_SIZE:
+            self._tab_templates.popitem(last=False)
+        return template
+
+    def _get_tab_mesh_data(self, as_dish: bool, diameter: float, segments: int, height: float, line_width: float, layer_count: int) -> MeshData:
+        """One MeshData shared by every tab of the same shape. Tabs only differ by their transformation.
+
+        Only held weakly here, so once the last tab using it is gone (including from the undo stack) so is the mesh."""
+        key = self._tab_template_key(as_dish, diameter, segments, height, line_width, layer_count)
+        mesh_data = self._tab_mesh_data.get(key)
+        if mesh_data is None:
+            vertices, normals, indices = self._get_tab_template(as_dish, diameter, segments, height, line_width, layer_count)
+            mesh_data = MeshData(vertices=vertices, normals=normals, indices=indices)
+            self._tab_mesh_data[key] = mesh_data
+        return mesh_data
 
     def removeAllSupportMesh(self):
-        if self._scene_tabs:
-            for node in self._scene_tabs:
-                if node:
-                    node_stack = node.callDecoration("getStack")
-                    if node_stack.getProperty("support_mesh", "value"):
-                        self._removeSupportMesh(node)
-            self._scene_tabs.clear()
+        self._remove_tabs_matching("all")
+
+    def removeTabs(self, data: QJSValue) -> None:
+        """Remove tabs picked by a filter: "all", "selected" (tabs on the selected objects) or "region" (tabs inside a
+        build plate rectangle given by min_x, max_x, min_z and max_z in scene coordinates)."""
+        variant = data.toVariant() if isinstance(data, QJSValue) else data
+        if not isinstance(variant, dict):
+            log("d", "removeTabs got %s which isn't a dict", variant)
+            return
+        tab_filter = variant.get("filter", "all")
+        region = None
+        if tab_filter == "region":
+            try:
+                region = (float(variant["min_x"]), float(variant["max_x"]), float(variant["min_z"]), float(variant["max_z"]))
+            except (KeyError, TypeError, ValueError) as e:
+                log("e", f"removeTabs got an invalid region in {variant}: {e}")
+                return
+            if not all(math.isfinite(edge) for edge in region):
+                log("e", f"removeTabs got an invalid region in {variant}")
+                return
+            # Whichever way round the corners were given
+            region = (min(region[0], region[1]), max(region[0], region[1]), min(region[2], region[3]), max(region[2], region[3]))
+        elif tab_filter not in ("all", "selected"):
+            log("e", f"removeTabs got an unknown filter {tab_filter!r}")
+            return
+        self._remove_tabs_matching(tab_filter, region)
+
+    def _remove_tabs_matching(self, tab_filter: str, region: tuple[float, float, float, float] = None) -> None:
+        with self._perf_stats.span("remove.total"):
+            self._remove_tabs_matching_timed(tab_filter, region)
+        self._perf_stats_changed()
+
+    def _remove_tabs_matching_timed(self, tab_filter: str, region: tuple[float, float, float, float]) -> None:
+        if tab_filter == "all":
+            tabs = self._tab_registry.getTabs()
+        elif tab_filter == "selected":
+            # A tab and the object it's on can both be selected, it still only wants removing once
+            tabs = {}
+            for selected_node in Selection.getAllSelectedObjects():
+                if self._tab_registry.isTab(selected_node):
+                    tabs[id(selected_node)] = selected_node
+                else:
+                    tabs.update((id(tab), tab) for tab in self._tab_registry.getTabsOf(selected_node))
+            tabs = list(tabs.values())
+        elif tab_filter == "region" and region is not None:
+            min_x, max_x, min_z, max_z = region
+            tabs = []
+            for tab in self._tab_registry.getTabs():
+                # A merged tab is all the tabs it was made from, it goes if any of them are in there
+                position = tab.getWorldPosition()
+                footprints = tab.callDecoration("getTabFootprints") + (position.x, position.z)
+                if np.any((footprints[:, 0] >= min_x) & (footprints[:, 0] <= max_x) & (footprints[:, 1] >= min_z) & (footprints[:, 1] <= max_z)):
+                    tabs.append(tab)
+        else:
+            log("e", f"_remove_tabs_matching got an unknown filter {tab_filter!r}")
+            return
+
+        if not tabs:
+            self._notification_add(catalog.i18nc("remove_none_text", "There aren't any tabs to delete."), 5)
+            return
+
+        removed = self._remove_tabs(tabs)
+        if not self._tab_registry.hasTabs():
             self._any_as_dish = False
-            self.propertyChanged.emit()
-            self._notification_add(catalog.i18nc("remove_all_text", "All tabs which the plugin has tracked have been deleted.\nSome may have lost tracking and need to be deleted manually."), 10)
+        self.propertyChanged.emit()
+        if tab_filter == "all":
+            self._notification_add(catalog.i18nc("remove_all_text", "All tabs have been deleted."), 10)
+        else:
+            self._notification_add(f'{catalog.i18nc("remove_some_text", "Tabs deleted:")} {removed}', 10)
+
+    def _remove_tabs(self, nodes: list[CuraSceneNode]) -> int:
+        """Remove a bunch of tabs as one undo step with one scene change."""
+        scene_op = GroupedOperation()
+        for node in nodes:
+            scene_op.addOperation(RemoveSceneNodeOperation(node))
+        with self._perf_stats.span("remove.scene"):
+            scene_op.push()
+            CuraApplication.getInstance().getController().getScene().sceneChanged.emit(nodes[-1])
+        log("d", "_remove_tabs removed %s tabs in one operation", len(nodes))
+        return len(nodes)
 
     # Source code from MeshTools Plugin
     # Copyright (c) 2020 Aldo Hoeben / fieldOfView
@@ -684,26 +1581,25 @@ class TabAnitWarpingReborn(Tool):
 
         return []
 
-    # Used to compare union convex hulls to allow for floating point inaccuracies
-    def _compare_polygons_with_tolerance(self, poly1: Polygon, poly2: Polygon, tolerance=1e-6):
-        points1 = poly1.getPoints()
-        points2 = poly2.getPoints()
-
-        if points1 is None and points2 is None:
-            return True
-        if points1 is None or points2 is None or len(points1) != len(points2):
-            return False
-
-        # Sort the points before comparison to handle different vertex order
-        sorted_points1 = np.sort(points1, axis=0)
-        sorted_points2 = np.sort(points2, axis=0)
-
-        return np.allclose(sorted_points1, sorted_points2, atol=tolerance, rtol=tolerance)
-
     # Automatic creation
     def addAutoTabMesh(self, data:QJSValue) -> None:
-        log("d", f"addAutoTabMesh got data {repr(data)}")
+        with self._perf_stats.span("auto.total"):
+            self._add_auto_tabs(data)
+        self._perf_stats_changed()
+
+    def _add_auto_tabs(self, data: QJSValue) -> None:
+        log("d", "addAutoTabMesh got data %r", data)
+        # Before anything else, there's no point checking the selection for a request that's going to be turned down
+        if self._auto_job is not None:
+            self._notification_add(catalog.i18nc("auto_tab_busy", "Still working on the last lot of automatic tabs."), 5)
+            return
         dense = True
+        spacing = 0.0
+        count = 0
+        include_corners = True
+        corners_only = False
+        threshold = 0.5
+        budget = 8
         # Make sure data is the right type before we mess with it:
         if data is not None and isinstance(data, QJSValue):
             # Convert it to a QVariant
@@ -711,20 +1607,46 @@ class TabAnitWarpingReborn(Tool):
             # Hope our QVariant is a dict like we passed
             if isinstance(variant, dict):
                 dense = variant.get("dense", True)
-                log("d", f"addAutoTabMesh from QVariant {variant} got dense {dense}")
+                # Optional extras for anything wanting finer control than the dense/sparse presets
+                try:
+                    spacing = float(variant.get("spacing", 0.0))
+                    count = int(variant.get("count", 0))
+                    threshold = float(variant.get("threshold", threshold))
+                    budget = int(variant.get("budget", budget))
+                except (TypeError, ValueError, OverflowError) as e:
+                    log("e", f"addAutoTabMesh got something that isn't a number in {variant}: {e}")
+                    return
+                if not (math.isfinite(spacing) and math.isfinite(threshold)):
+                    log("e", f"addAutoTabMesh got a spacing or threshold that isn't a number in {variant}")
+                    return
+                # Nothing sensible to do with negatives, 0 is the same as not giving them (and no limit for budget)
+                spacing = max(spacing, 0.0)
+                count = max(count, 0)
+                threshold = min(max(threshold, 0.0), 1.0)
+                budget = max(budget, 0)
+                include_corners = bool(variant.get("corners", True))
+                # Corners mode only puts tabs where things are most likely to warp
+                corners_only = variant.get("mode") == "corners"
+                log("d", "addAutoTabMesh from QVariant %s got dense %s", variant, dense)
             else:
-                log("d", f"addAutoTabMesh got QVariant {variant} which isn't a dict")
+                log("d", "addAutoTabMesh got QVariant %s which isn't a dict", variant)
         else:
-            log("d", f"addAutoTabMesh did not get a QJSValue passed to it. It got {data}")
+            log("d", "addAutoTabMesh did not get a QJSValue passed to it. It got %s", data)
+
+        if spacing <= 0:
+            # Minimum distance between tabs along the outline
+            spacing = self._tab_size if corners_only or not dense else self._tab_size * 0.5
+        auto_placement = AutoTabPlacement(spacing, include_corners, count, corners_only, threshold, budget)
 
         nodes_list = self._getAllSelectedNodes()
         if not nodes_list:
-            nodes_list = DepthFirstIterator(self._application.getController().getScene().getRoot())
+            nodes_list = self._tab_registry.getModels()
 
+        valid_nodes: list[CuraSceneNode] = []
         for node in nodes_list:
             if not node.callDecoration("isSliceable"):
                 continue
-            log("d", f"{node.getName()} is sliceable")
+            log("d", "%s is sliceable", node.getName())
             node_stack=node.callDecoration("getStack")
             if not node_stack:
                 continue
@@ -735,95 +1657,431 @@ class TabAnitWarpingReborn(Tool):
 
             if any((type_infill_mesh, type_cutting_mesh, type_support_mesh, type_anti_overhang_mesh)):
                 continue
-            log("d", f"{node.getName()} is a valid mesh")
-
-            shapes: list[np.ndarray] = None
-            try:
-                shapes = self._get_base_convex_hulls(node)
-            except Exception as e:
-                log("e", f"Exception in _get_base_convex_hulls: {e}")
-            if shapes is not None:
-                for shape in shapes:
-                    log("d", f"addAutoTabMesh: just got base convex hulls {shape}")
-
-                # Filter out any hulls completely inside one another
-                if len(shapes) > 1:
-                    filtered_hulls = []
-                    log("d", "Filtering hulls")
-                    true_element = True
-                    false_element = False
-                    is_base = [true_element for _ in range(len(shapes))]
-                    is_child = [false_element for _ in range(len(shapes))]
-                    for a, hull_a in enumerate(shapes):
-                        for b, hull_b in enumerate(shapes):
-                            if a == b:
-                                continue
-                            if is_child[a] or is_child[b]:
-                                continue
-                            try:
-                                union_hull = hull_a.unionConvexHulls(hull_b)
-                            except Exception as e:
-                                log("e", f"Couldn't create union hull for overlap test: {e}")
-                            log("d", f"union_hull = {union_hull}")
-                            if self._compare_polygons_with_tolerance(union_hull, hull_a):
-                                # b is fully contained within a
-                                is_base[b] = False
-                                is_child[b] = True
-                            if self._compare_polygons_with_tolerance(union_hull, hull_b):
-                                # a is fully contained within b
-                                is_base[a] = False
-                                is_child[a] = True
-                                break
-                    log("d", f"Looped through hulls, is_base = {is_base}, is_child = {is_child}")
-                    for i, hull in enumerate(shapes):
-                        if is_base[i]:
-                            filtered_hulls.append(hull)
-                    shapes = filtered_hulls
-
-            # If the complicated way doesn't work fall back to the regular way
-            if shapes is None or len(shapes) == 0:
-                log("i", "addAutoTabMesh: falling back to regular hull")
-                hull_polygon: Polygon = node.callDecoration("getConvexHullBoundary")
-                if hull_polygon is None:
-                    hull_polygon = node.callDecoration("getConvexHull")
-
-                if not hull_polygon or not hull_polygon.isValid():
-                    log("w", f"Object {node.getName()} cannot be calculated because it has no convex hull.")
-                    continue
-                shapes = [hull_polygon]
+            log("d", "%s is a valid mesh", node.getName())
+            valid_nodes.append(node)
+
+        heights = self._base_section_heights()
+        all_shapes, pending = self._prepare_base_outlines(valid_nodes, heights)
+        if not pending:
+            # Everything's cached so there's nothing worth going into the background for
+            self._place_auto_tabs(valid_nodes, all_shapes, auto_placement)
+            return
 
-            minimum_gap = self._tab_size * 0.5 if dense else self._tab_size
+        # The slow bit goes in the background so Cura doesn't freeze, and the rest happens when it's done
+        log("d", "_add_auto_tabs working out %s of %s nodes in the background", len(pending), len(valid_nodes))
+        self._auto_request = AutoTabRequest(valid_nodes, heights, auto_placement, all_shapes, pending,
+                                            [node.getWorldTransformation().getData().tobytes() for node in valid_nodes], time.perf_counter())
+        self._auto_job = BaseOutlineJob(pending, heights, self._try_compute_base_hulls)
+        self._auto_job.progress.connect(self._onAutoJobProgress)
+        self._auto_job.finished.connect(self._onAutoJobFinished)
+        self._set_auto_progress(0)
+        self._auto_job.start()
+
+    def _onAutoJobProgress(self, job: BaseOutlineJob, progress: int) -> None:
+        if job is self._auto_job:
+            self._set_auto_progress(progress)
+
+    def _onAutoJobFinished(self, job: BaseOutlineJob) -> None:
+        """Back on the main thread with the base outlines, so the tabs can be added in one go."""
+        if job is not self._auto_job:
+            return
+        request = self._auto_request
+        self._auto_job = None
+        self._auto_request = None
+        self._set_auto_progress(-1)
+        if job.isCancelled():
+            return
+        if job.getResult() is None:
+            log("e", f"Background job for automatic tabs failed: {job.getError()}")
+            self._notification_add(catalog.i18nc("auto_tab_failed", "Something went wrong working out the automatic tabs. Nothing was changed."), 10)
+            return
+        self._perf_stats.record("auto.job", time.perf_counter() - request.started)
+
+        with self._perf_stats.span("auto.finish"):
+            # Anything deleted, moved or rotated while the job was running would get tabs in the wrong place
+            nodes = request.nodes
+            unchanged = [node.getParent() is not None and node.getWorldTransformation().getData().tobytes() == transform
+                         for node, transform in zip(nodes, request.transforms)]
+            kept = [(entry, outcome) for entry, outcome in zip(request.pending, job.getResult()) if unchanged[entry[0]]]
+            all_shapes = self._finish_base_outlines(nodes, request.heights, request.outlines, [entry for entry, _ in kept], [outcome for _, outcome in kept])
+            changed_count = unchanged.count(False)
+            if changed_count:
+                self._notification_add(f'{catalog.i18nc("auto_tab_changed", "Objects skipped because they changed while tabs were being worked out:")} {changed_count}', 10)
+            self._place_auto_tabs([node for node, keep in zip(nodes, unchanged) if keep],
+                                  [shapes for shapes, keep in zip(all_shapes, unchanged) if keep], request.auto_placement)
+        self._perf_stats_changed()
+
+    def cancelAutoTabs(self) -> None:
+        """Stop working out automatic tabs. Nothing's been added yet so nothing needs undoing."""
+        if self._auto_job is None:
+            return
+        log("d", "cancelAutoTabs cancelling the background job")
+        self._auto_job.cancel()
+        self._auto_job = None
+        self._auto_request = None
+        self._set_auto_progress(-1)
+        self._notification_add(catalog.i18nc("auto_tab_cancelled", "Automatic tabs cancelled. Nothing was changed."), 5)
+
+    def _set_auto_progress(self, progress: int) -> None:
+        if progress != self._auto_progress:
+            self._auto_progress = progress
+            self.propertyChanged.emit()
 
-            for shape in shapes:
-                shape_points = shape.getPoints()
-                if shape_points is None:
-                    continue
-                    
-                log("d", "addAutoTabMesh: in loop for each shape")
-                last_tab_position = None
-                first_point = Vector(shape_points[0][0], 0, shape_points[0][1])
-
-                for i, point in enumerate(shape_points):
-                    new_position = Vector(point[0], 0, point[1])
-                    difference_vector = last_tab_position - new_position if last_tab_position else Vector(0,0,0)
-                    # Guarantee distance will always be large enough even if previous position not set
-                    difference_length = difference_vector.length() if last_tab_position else minimum_gap * 2
-
-                    first_to_last_distance = (first_point - new_position).length() if i == len(shape_points) - 1 else 0
-                    if (first_to_last_distance == 0 and difference_length >= minimum_gap) or (first_to_last_distance >= minimum_gap and difference_length >= minimum_gap):
-                        self._createSupportMesh(node, new_position)
-                        last_tab_position = new_position
+    def _place_auto_tabs(self, valid_nodes: list[CuraSceneNode], all_shapes: list[list[Polygon]], auto_placement: AutoTabPlacement) -> None:
+        """Put automatic tabs around the nodes now their base outlines are known."""
+        spacing = auto_placement.spacing
+        corners_only = auto_placement.corners_only
+        with self._perf_stats.span("auto.placement"):
+            # Every object's base is in here (the ones just worked out were cached), so tabs for one object don't land on another
+            placement_hash = self._get_placement_hash()
+            # Tabs from this run, by object
+            run_tabs = TabGeometry.TabSpatialHash(self._tab_size)
+            skipped_count = 0
+
+            placements: list[tuple[CuraSceneNode, Vector]] = []
+            for node, shapes in zip(valid_nodes, all_shapes):
+                for x, z in self._auto_tab_positions(self._tab_outlines(node, shapes), auto_placement):
+                    position = Vector(float(x), 0, float(z))
+                    # Closer than half the spacing is a duplicate, like from running it twice. The object's own new tabs are
+                    # already spaced out along its outline, even if the ones either side of a corner are closer straight across.
+                    if (self._check_tab_overlap(placement_hash, node, position, spacing * 0.5)
+                        or run_tabs.tab_near(position.x, position.z, spacing * 0.5, (id(node),))):
+                        skipped_count += 1
+                        continue
+                    run_tabs.add_tab(position.x, position.z, id(node))
+                    placements.append((node, position))
+
+        if corners_only and valid_nodes and not placements and skipped_count == 0:
+            self._notification_add(catalog.i18nc("auto_tab_no_corners", "Couldn't find any corners likely to warp. Try one of the other automatic options."), 10)
+
+        if skipped_count > 0:
+            self._notification_add(f'{catalog.i18nc("auto_tab_skipped", "Tabs skipped because they would overlap another tab or object:")} {skipped_count}', 10)
+
+        # Add every tab at once so it's a single undo step and the scene only changes once
+        self._create_tabs(placements, self._merge_tabs, auto_placement)
 
         # Switch to translate tool because you're probably not going to want to create/remove tabs straight away.
         self._controller.setActiveTool("TranslateTool")
         Message(text=catalog.i18nc("auto_tab_switch_tool","Automatic tab creation finished. Switching to move tool."), lifetime=15, title=self._default_message_title).show()
 
-    def _get_base_convex_hulls(self, node: CuraSceneNode, height: float = 0.2) -> list[np.ndarray]:
-        if not node:
+    def _tab_outlines(self, node: CuraSceneNode, shapes: list[Polygon]) -> list[np.ndarray]:
+        """Points of the outlines to put automatic tabs around. The base outlines if there are any, otherwise Cura's convex hull."""
+        # If the complicated way doesn't work fall back to the regular way
+        if shapes is None or len(shapes) == 0:
+            log("i", "addAutoTabMesh: falling back to regular hull")
+            hull_polygon: Polygon = node.callDecoration("getConvexHullBoundary")
+            if hull_polygon is None:
+                hull_polygon = node.callDecoration("getConvexHull")
+
+            if not hull_polygon or not hull_polygon.isValid():
+                log("w", f"Object {node.getName()} cannot be calculated because it has no convex hull.")
+                return []
+            shapes = [hull_polygon]
+
+        outlines = []
+        for shape in shapes:
+            shape_points = shape.getPoints()
+            if shape_points is not None and len(shape_points) > 0:
+                outlines.append(shape_points)
+        return outlines
+
+    @staticmethod
+    def _auto_tab_positions(outlines: list[np.ndarray], auto_placement: AutoTabPlacement) -> np.ndarray:
+        """XZ positions for automatic tabs around all of an object's outlines."""
+        if not outlines:
+            return np.zeros((0, 2))
+        if auto_placement.corners_only:
+            return TabGeometry.corner_tab_positions(outlines, auto_placement.spacing, auto_placement.threshold, auto_placement.budget)
+        return np.concatenate([TabGeometry.perimeter_tab_positions(points, auto_placement.spacing, auto_placement.include_corners, auto_placement.count)
+                               for points in outlines])
+
+    # Putting automatic tabs back when their object gets rotated or scaled
+    def _onTabAdded(self, tab: SceneNode) -> None:
+        if tab.callDecoration("getTabAutoPlacement") is not None:
+            self._watch_tab_parent(tab.getParent())
+
+    def _watch_tab_parent(self, parent: SceneNode) -> None:
+        if parent is None or parent in self._reseat_watched or parent is self._controller.getScene().getRoot():
+            return
+        self._reseat_watched[parent] = self._rotation_and_scale(parent)
+        parent.transformationChanged.connect(self._onTabParentTransformationChanged)
+
+    def _unwatch_tab_parent(self, parent: SceneNode) -> None:
+        self._reseat_watched.pop(parent, None)
+        parent.transformationChanged.disconnect(self._onTabParentTransformationChanged)
+
+    @staticmethod
+    def _rotation_and_scale(node: SceneNode) -> np.ndarray:
+        return node.getWorldTransformation().getData()[:3, :3].copy()
+
+    @staticmethod
+    def _tab_is_upright(tab: SceneNode) -> bool:
+        """Whether a tab is still flat on the build plate at its normal size. It can turn around Y and still be fine."""
+        basis = tab.getWorldTransformation().getData()[:3, :3]
+        return bool(np.allclose(np.linalg.norm(basis, axis=0), 1.0, atol=1e-3) and abs(basis[1, 1] - 1.0) < 1e-3)
+
+    def _onTabParentTransformationChanged(self, node: SceneNode) -> None:
+        # Parents pass on changes from their children as well, including their tabs moving
+        if node not in self._reseat_watched:
+            return
+        self._reseat_pending.add(node)
+        # Wait until it stops changing, like at the end of dragging the rotate handle
+        self._reseat_timer.start()
+
+    def _reseat_pending_tabs(self) -> None:
+        parents = [parent for parent in self._reseat_pending if parent.getParent() is not None]
+        self._reseat_pending.clear()
+        with self._perf_stats.span("reseat.total"):
+            self._reseat_tabs(parents)
+        self._perf_stats_changed()
+
+    def _reseat_tabs(self, parents: list[SceneNode]) -> None:
+        """Put the automatic tabs of these objects back around their base, if they've been rotated or scaled since.
+
+        Only these objects get their base worked out again. Tabs still in the right place and the right way up stay where they are,
+        ones that just need moving get moved and the rest get replaced or removed, all in one undo step."""
+        jobs: list[tuple[SceneNode, list[SceneNode]]] = []
+        for parent in parents:
+            auto_tabs = [tab for tab in self._tab_registry.getTabsOf(parent) if tab.callDecoration("getTabAutoPlacement") is not None]
+            if not auto_tabs:
+                self._unwatch_tab_parent(parent)
+                continue
+            transform = self._rotation_and_scale(parent)
+            if np.allclose(transform, self._reseat_watched[parent], atol=1e-6):
+                # It only moved, and the tabs went with it
+                continue
+            self._reseat_watched[parent] = transform
+            jobs.append((parent, auto_tabs))
+        if not jobs:
+            return
+
+        with self._perf_stats.span("reseat.outlines"):
+            all_shapes = self._get_base_outlines_for_nodes([parent for parent, _ in jobs])
+
+        placement_hash = self._get_placement_hash()
+        # These objects' own tabs are about to move, so they shouldn't get in the way of where they're moving to
+        moving_tabs = {id(tab) for _, tabs in jobs for tab in tabs}
+        run_tabs = TabGeometry.TabSpatialHash(self._tab_size)
+
+        scene_op = GroupedOperation()
+        changes = 0
+        for (parent, tabs), shapes in zip(jobs, all_shapes):
+            auto_placement = tabs[0].callDecoration("getTabAutoPlacement")
+            spacing = auto_placement.spacing
+            targets: list[Vector] = []
+            for x, z in self._auto_tab_positions(self._tab_outlines(parent, shapes), auto_placement):
+                position = Vector(float(x), 0, float(z))
+                if (self._check_tab_overlap(placement_hash, parent, position, spacing * 0.5, moving_tabs)
+                    or run_tabs.tab_near(position.x, position.z, spacing * 0.5, (id(parent),))):
+                    continue
+                run_tabs.add_tab(position.x, position.z, id(parent))
+                targets.append(position)
+
+            if any(tab.callDecoration("getTabFootprints").shape[0] > 1 for tab in tabs):
+                # The footprints in a merged tab don't turn with the object, so it just gets made again
+                for tab in tabs:
+                    scene_op.addOperation(RemoveSceneNodeOperation(tab))
+                self._create_tabs([(parent, position) for position in targets], True, auto_placement, scene_op)
+                changes += 1
+                continue
+
+            pairs, leftover_tabs, additions = self._match_tabs(tabs, targets, spacing)
+            for tab, position in pairs:
+                if not self._tab_is_upright(tab):
+                    # Tilted or scaled along with the object, so it needs replacing
+                    scene_op.addOperation(RemoveSceneNodeOperation(tab))
+                    additions.append(position)
+                elif (tab.getWorldPosition() - position).length() > 1e-3:
+                    scene_op.addOperation(TranslateOperation(tab, position, set_position = True))
+                    changes += 1
+            for tab in leftover_tabs:
+                scene_op.addOperation(RemoveSceneNodeOperation(tab))
+                changes += 1
+            changes += len(self._create_tabs([(parent, position) for position in additions], False, auto_placement, scene_op))
+
+        if changes == 0:
+            # Nothing to do, like after undoing a rotation. Not pushing anything keeps the redo stack intact.
+            return
+        scene_op.push()
+        self._controller.getScene().sceneChanged.emit(jobs[-1][0])
+        self.propertyChanged.emit()
+        log("d", "_reseat_tabs made %s changes to tabs on %s objects", changes, len(jobs))
+
+    @staticmethod
+    def _match_tabs(tabs: list[SceneNode], targets: list[Vector], max_distance: float) -> tuple[list[tuple[SceneNode, Vector]], list[SceneNode], list[Vector]]:
+        """Pair up existing tabs with where tabs should be now, closest first.
+
+        Gives back the (tab, position) pairs, tabs without a position and positions without a tab."""
+        if not tabs or not targets:
+            return [], list(tabs), list(targets)
+        current = np.array([[tab.getWorldPosition().x, tab.getWorldPosition().z] for tab in tabs])
+        wanted = np.array([[target.x, target.z] for target in targets])
+        distances = np.linalg.norm(current[:, np.newaxis, :] - wanted[np.newaxis, :, :], axis=2)
+        tab_used = np.zeros(len(tabs), dtype=bool)
+        target_used = np.zeros(len(targets), dtype=bool)
+        pairs = []
+        for flat_index in np.argsort(distances, axis=None):
+            i, j = divmod(int(flat_index), len(targets))
+            if distances[i, j] > max_distance:
+                break
+            if tab_used[i] or target_used[j]:
+                continue
+            tab_used[i] = target_used[j] = True
+            pairs.append((tabs[i], targets[j]))
+        return (pairs,
+                [tab for tab, used in zip(tabs, tab_used) if not used],
+                [target for target, used in zip(targets, target_used) if not used])
+
+    def _base_section_heights(self) -> tuple[float, ...]:
+        """Heights above the bottom of an object to slice it at to find its base.
+
+        Just the one unless there's more than one base layer, then it's the middle of each of them."""
+        if self._base_layers <= 1:
+            return (0.2,)
+        snapshot = self._get_stack_snapshot()
+        return tuple(round(snapshot.layer_height_0 * 0.5 if layer == 0 else snapshot.layer_height_0 + snapshot.layer_height * (layer - 0.5), 4)
+                     for layer in range(self._base_layers))
+
+    def _get_base_outlines_for_nodes(self, nodes: list[CuraSceneNode], heights: tuple[float, ...] = None) -> list[list[Polygon]]:
+        """Base outlines for a list of nodes, in the same order. None for any node they couldn't be found for.
+
+        Cached until a node's mesh or world transformation changes, since working it out is the slow part.
+        Anything not cached gets worked out on a thread pool, since each node is independent and NumPy lets go of the GIL."""
+        if heights is None:
+            heights = self._base_section_heights()
+        results, pending = self._prepare_base_outlines(nodes, heights)
+        if not pending:
+            return results
+
+        log("d", "_get_base_outlines_for_nodes working out %s of %s nodes", len(pending), len(nodes))
+        with self._perf_stats.span("base.compute"):
+            if len(pending) == 1:
+                # Not worth starting threads for
+                outcomes = [self._try_compute_base_hulls(*pending[0][1], heights)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+                    outcomes = list(executor.map(lambda job: self._try_compute_base_hulls(*job[1], heights), pending))
+        return self._finish_base_outlines(nodes, heights, results, pending, outcomes)
+
+    def _prepare_base_outlines(self, nodes: list[CuraSceneNode], heights: tuple[float, ...]) -> tuple[list[list[Polygon]], list[tuple[int, tuple]]]:
+        """Cached base outlines for each node (None if there aren't any), and (index, geometry) for the ones that need working out."""
+        results: list[list[Polygon]] = [None] * len(nodes)
+        pending: list[tuple[int, tuple]] = []
+        for i, node in enumerate(nodes):
+            cached = self._get_cached_base_outlines(node, heights)
+            if cached is not None:
+                results[i] = cached
+                continue
+            geometry = self._get_node_geometry(node)
+            if geometry is not None:
+                pending.append((i, geometry + (self._get_cached_face_index(node, geometry[2]),)))
+        return results, pending
+
+    def _finish_base_outlines(self, nodes: list[CuraSceneNode], heights: tuple[float, ...], results: list[list[Polygon]],
+                              pending: list[tuple[int, tuple]], outcomes: list[tuple]) -> list[list[Polygon]]:
+        """Turn what came back from _try_compute_base_hulls into outlines and cache them. Has to be on the main thread."""
+        for (i, _), (hulls, face_index, error) in zip(pending, outcomes):
+            node = nodes[i]
+            if error is not None:
+                log("e", f"Exception finding the base of {node.getName()}: {error}")
+                if trimesh is None:
+                    continue
+                try:
+                    with self._perf_stats.span("base.trimesh"):
+                        shapes = self._get_base_convex_hulls_trimesh(node, heights[0])
+                        shapes = [shapes[j] for j in TabGeometry.filter_contained_hulls([shape.getPoints() for shape in shapes])]
+                except Exception as e:
+                    log("e", f"Exception in _get_base_convex_hulls_trimesh: {e}")
+                    continue
+            else:
+                shapes = [Polygon(hull) for hull in hulls]
+                self._store_face_index(node, face_index)
+
+            for shape in shapes:
+                log("d", "_get_base_outlines_for_nodes: just got base convex hull %s", shape)
+            self._store_base_outlines(node, heights, shapes)
+            results[i] = shapes
+        return results
+
+    @staticmethod
+    def _try_compute_base_hulls(vertices: np.ndarray, indices: np.ndarray, transformation: np.ndarray, face_index: TabGeometry.FaceHeightIndex,
+                                heights: tuple[float, ...]) -> tuple[list[np.ndarray], TabGeometry.FaceHeightIndex, Exception]:
+        """Run on a worker thread, so it hands back any exception instead of raising it. Also hands back the face index so it can be kept."""
+        try:
+            if face_index is None or face_index.reach < max(heights):
+                face_index = TabGeometry.FaceHeightIndex(vertices, indices, transformation[:3, :3], max(max(heights), FACE_INDEX_REACH))
+            return TabGeometry.compute_base_hulls(vertices, indices, transformation, heights, face_index), face_index, None
+        except Exception as e:
+            return None, None, e
+
+    @staticmethod
+    def _get_node_geometry(node: CuraSceneNode) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The plain arrays base detection needs from a node, so it doesn't need to touch the node itself."""
+        mesh_data = node.getMeshData()
+        if not mesh_data or mesh_data.getVertices() is None:
             return None
+
+        indices = mesh_data.getIndices()
+        if indices is None:
+            # some file formats (eg 3mf) don't supply indices, but have unique vertices per face
+            indices = np.arange(mesh_data.getVertexCount()).reshape(-1, 3)
+        return mesh_data.getVertices(), indices, node.getWorldTransformation().getData()
+
+    def _get_cached_base_outlines(self, node: CuraSceneNode, heights: tuple[float, ...]) -> list[Polygon]:
+        cache_key = id(node)
+        cached = self._base_outline_cache.get(cache_key)
+        if cached is None:
+            return None
+        node_ref, mesh_ref, cached_transform, cached_heights, outlines = cached
+        if (node_ref() is node and mesh_ref() is node.getMeshData() and cached_heights == heights
+            and cached_transform == node.getWorldTransformation().getData().tobytes()):
+            log("d", "_get_cached_base_outlines using cached outlines for %s", node.getName())
+            self._base_outline_cache.move_to_end(cache_key)
+            return outlines
+        # Something about the node changed since it was cached
+        del self._base_outline_cache[cache_key]
+        self._onPlacementNodeChanged(node)
+        return None
+
+    def _store_base_outlines(self, node: CuraSceneNode, heights: tuple[float, ...], outlines: list[Polygon]) -> None:
+        mesh_data = node.getMeshData()
+        if mesh_data is None:
+            return
+        transform_key = node.getWorldTransformation().getData().tobytes()
+        self._base_outline_cache[id(node)] = (weakref.ref(node), weakref.ref(mesh_data), transform_key, heights, outlines)
+        # Better than the convex hull it's been using for overlap checks
+        self._onPlacementNodeChanged(node)
+        if len(self._base_outline_cache) > BASE_OUTLINE_CACHE_SIZE:
+            self._base_outline_cache.popitem(last=False)
+
+    def _get_cached_face_index(self, node: CuraSceneNode, transformation: np.ndarray) -> TabGeometry.FaceHeightIndex:
+        """The face index from last time, as long as the mesh hasn't been rotated or scaled since. Moving it doesn't matter."""
+        cache_key = id(node)
+        cached = self._face_index_cache.get(cache_key)
+        if cached is None:
+            return None
+        node_ref, mesh_ref, rotation_key, face_index = cached
+        if node_ref() is node and mesh_ref() is node.getMeshData() and rotation_key == transformation[:3, :3].tobytes():
+            self._face_index_cache.move_to_end(cache_key)
+            return face_index
+        del self._face_index_cache[cache_key]
+        return None
+
+    def _store_face_index(self, node: CuraSceneNode, face_index: TabGeometry.FaceHeightIndex) -> None:
+        mesh_data = node.getMeshData()
+        if mesh_data is None or face_index is None:
+            return
+        rotation_key = node.getWorldTransformation().getData()[:3, :3].tobytes()
+        self._face_index_cache[id(node)] = (weakref.ref(node), weakref.ref(mesh_data), rotation_key, face_index)
+        if len(self._face_index_cache) > BASE_OUTLINE_CACHE_SIZE:
+            self._face_index_cache.popitem(last=False)
+
+    def _get_base_convex_hulls_trimesh(self, node: CuraSceneNode, height: float = 0.2) -> list[Polygon]:
+        """The original way of finding the base, using trimesh. Slower but it's been around the block."""
         trimesh_mesh = self._toTriMesh(node.getMeshDataTransformed())
-        log("d", f"_get_base_convex_hulls using trimesh = {trimesh_mesh}")
-        log("d", f"_get_base_convex_hulls trimesh is watertight? {trimesh_mesh.is_watertight}")
+        log("d", "_get_base_convex_hulls_trimesh using trimesh = %s", trimesh_mesh)
+        if DEBUG_MODE:  # Working out if it's watertight isn't free
+            log("d", "_get_base_convex_hulls_trimesh trimesh is watertight? %s", trimesh_mesh.is_watertight)
         min_y = trimesh_mesh.bounds[0][1]
         slice_y = min_y + height
 
@@ -856,7 +2114,7 @@ class TabAnitWarpingReborn(Tool):
     #----------------------------------------
     # Initial Source code from  fieldOfView
     #----------------------------------------
-    def _toTriMesh(self, mesh_data: MeshData) -> trimesh.base.Trimesh:
+    def _toTriMesh(self, mesh_data: MeshData) -> "trimesh.base.Trimesh":
         if not mesh_data:
             return trimesh.base.Trimesh()
 
@@ -904,6 +2162,21 @@ class TabAnitWarpingReborn(Tool):
         self._layer_count = int_value
         self._preferences.setValue("tabawreborn/layer_count", int_value)
 
+    def getBaseLayers(self) -> int:
+        return self._base_layers
+
+    def setBaseLayers(self, count: str) -> None:
+        try:
+            int_value = int(count)
+        except ValueError:
+            return
+
+        if int_value < 1:
+            return
+
+        self._base_layers = int_value
+        self._preferences.setValue("tabawreborn/base_layers", int_value)
+
     def getXYDistance(self) -> float:
         #log("d", f"getXYDistance accessed with self._xy_distance = {self._xy_distance}")
         return self._xy_distance
@@ -928,6 +2201,20 @@ class TabAnitWarpingReborn(Tool):
         self._as_dish = AsDish
         self._preferences.setValue("tabawreborn/create_dish", AsDish)
 
+    def getMergeTabs(self) -> bool:
+        return self._merge_tabs
+
+    def setMergeTabs(self, MergeTabs: bool) -> None:
+        self._merge_tabs = MergeTabs
+        self._preferences.setValue("tabawreborn/merge_tabs", MergeTabs)
+
+    def getPaintMode(self) -> bool:
+        return self._paint_mode
+
+    def setPaintMode(self, PaintMode: bool) -> None:
+        self._paint_mode = PaintMode
+        self._preferences.setValue("tabawreborn/paint_mode", PaintMode)
+
     def getInputsValid(self) -> bool:
         #log("d", f"getInputsValid accessed with self._inputs_valid = {self._inputs_valid}")
         return self._inputs_valid
@@ -944,10 +2231,25 @@ class TabAnitWarpingReborn(Tool):
         log("d", "Something tried to call setNotifications")
         return
 
+    def getAutoProgress(self) -> int:
+        return self._auto_progress
+
+    def setAutoProgress(self, value: int) -> None:
+        """Only the background job gets to change this."""
+        return
+
+    def getPerfStats(self) -> str:
+        return self._perf_stats.summary() if self._show_timings else ""
+
+    def setPerfStats(self, value: str) -> None:
+        """Setting it to anything resets the timings."""
+        self._perf_stats.reset()
+        self.propertyChanged.emit()
+
     def getLogMessage(self) -> str:
         """ This is just here so I can use the setter to log stuff. """
         log("d", "Something tried to call getLogMessage")
         return ""
 
     def setLogMessage(self, message: str) -> None:
-        log("d", f"TabAntiWarpingReborn QML Log: {message}")
+        log("d", "TabAntiWarpingReborn QML Log: %s", message)
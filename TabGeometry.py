@@ -0,0 +1,714 @@
+#--------------------------------------------------------------------------------------------
+# Tab Anti-Warping Reborn by Slashee the Cow copyright 2025-
+#
+# The geometry behind the tabs: building tab meshes, finding the base of an object and working
+# out where tabs go on it. Only needs NumPy and SciPy, not Cura, so it can be run (and timed)
+# on its own. Everything works in Cura's coordinates: Y is up and the build plate is X/Z.
+#--------------------------------------------------------------------------------------------
+
+import math
+from typing import Sequence
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import ConvexHull, QhullError
+
+def ring_points(radius: float, y: float, cos: np.ndarray, sin: np.ndarray) -> np.ndarray:
+    """Points around a horizontal circle, one for each angle in cos/sin."""
+    return np.column_stack((radius * cos, np.full_like(cos, y), radius * sin))
+
+def calculate_normals(vertices: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Per-vertex normals from the faces around each vertex, pointing out of anticlockwise faces like Uranium's."""
+    faces = vertices[indices]
+    face_normals = np.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    lengths = np.linalg.norm(face_normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    face_normals /= lengths[:, np.newaxis]
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, indices[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    return (normals / lengths[:, np.newaxis]).astype(np.float32)
+
+def stack_vertex_blocks(*blocks: np.ndarray) -> tuple[np.ndarray, list[int]]:
+    """All the blocks of vertices as one float32 array, and the index each block starts at in it."""
+    starts = np.cumsum([0] + [len(block) for block in blocks[:-1]]).tolist()
+    return np.concatenate(blocks).astype(np.float32), starts
+
+def fan_faces(centre: int, ring: int, segments: int, reverse: bool = False) -> np.ndarray:
+    """Triangles from a centre vertex to each segment of a ring of vertices starting at index ring."""
+    this = ring + np.arange(segments)
+    after = ring + (np.arange(segments) + 1) % segments
+    if reverse:
+        this, after = after, this
+    return np.column_stack((np.full(segments, centre), this, after))
+
+def band_faces(upper: int, lower: int, segments: int, reverse: bool = False) -> np.ndarray:
+    """Two triangles per segment joining a ring of vertices starting at upper to one starting at lower."""
+    this = np.arange(segments)
+    after = (this + 1) % segments
+    if reverse:
+        this, after = after, this
+    return np.concatenate((
+        np.column_stack((upper + this, upper + after, lower + after)),
+        np.column_stack((lower + after, lower + this, upper + this)),
+    ))
+
+def create_dish_mesh(base_diameter: float, segments: int, top_height: float, line_width: float, layer_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vertices, normals and indices for a "dish" style adhesion tab sitting on y = 0.
+
+    Vertices are shared between faces on the same surface. Each flat surface gets its own copy of the
+    rings it shares with a sloped one so the edges between them stay sharp. That's 8 * segments + 2 vertices
+    and 8 * segments triangles, wound anticlockwise from outside."""
+    base_radius = base_diameter / 2
+    # First layer length
+    max_y = top_height
+    if layer_count > 1:
+        cap_height = top_height * 2
+    else:
+        cap_height = top_height * 3
+    min_y = 0.0
+
+    cap_radius = math.tan(math.radians(45)) * (top_height * 3) + base_radius
+    # Top inside radius
+    inner_radius_cap = cap_radius - (1.8 * line_width)
+    # Top radius
+    inner_radius_base = base_radius - (1.8 * line_width)
+
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+
+    cap = ring_points(cap_radius, cap_height, cos, sin)
+    inner_cap = ring_points(inner_radius_cap, cap_height, cos, sin)
+    base = ring_points(base_radius, min_y, cos, sin)
+    inner_base = ring_points(inner_radius_base, max_y, cos, sin)
+
+    vertices, (top_inner, top_outer, side_1_top, side_1_bottom, side_2_top, side_2_bottom,
+               bottom_top_centre, bottom_top, bottom_centre, bottom) = stack_vertex_blocks(
+        # Top
+        inner_cap, cap,
+        # Side 1
+        cap, base,
+        # Side 2
+        inner_cap, inner_base,
+        # Bottom Top
+        np.array([[0.0, max_y, 0.0]]), inner_base,
+        # Bottom
+        np.array([[0.0, min_y, 0.0]]), base,
+    )
+    this = np.arange(segments)
+    after = (this + 1) % segments
+    indices = np.concatenate((
+        # Top
+        np.column_stack((top_inner + this, top_outer + after, top_outer + this)),
+        np.column_stack((top_inner + after, top_outer + after, top_inner + this)),
+        # Side 1
+        band_faces(side_1_top, side_1_bottom, segments),
+        # Side 2
+        np.column_stack((side_2_bottom + after, side_2_top + after, side_2_top + this)),
+        np.column_stack((side_2_top + this, side_2_bottom + this, side_2_bottom + after)),
+        # Bottom Top
+        fan_faces(bottom_top_centre, bottom_top, segments, reverse = True),
+        # Bottom
+        fan_faces(bottom_centre, bottom, segments),
+    )).astype(np.int32)
+
+    return vertices, calculate_normals(vertices, indices), indices
+
+def create_cylinder_mesh(base_diameter: float, segments: int, cylinder_height: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vertices, normals and indices for a cylindrical adhesion tab sitting on y = 0.
+
+    Vertices are shared between faces on the same surface, with separate copies of the top and bottom rings
+    for the ends and the side so the edges between them stay sharp. That's 4 * segments + 2 vertices and
+    4 * segments triangles, wound anticlockwise from outside."""
+    base_radius = base_diameter / 2
+    # First layer length
+    max_y = cylinder_height
+    min_y = 0.0
+
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+
+    top = ring_points(base_radius, max_y, cos, sin)
+    bottom = ring_points(base_radius, min_y, cos, sin)
+
+    vertices, (top_centre, top_cap, side_top, side_bottom, bottom_centre, bottom_cap) = stack_vertex_blocks(
+        # Top
+        np.array([[0.0, max_y, 0.0]]), top,
+        # Side
+        top, bottom,
+        # Bottom
+        np.array([[0.0, min_y, 0.0]]), bottom,
+    )
+    indices = np.concatenate((
+        # Top
+        fan_faces(top_centre, top_cap, segments, reverse = True),
+        # Side
+        band_faces(side_top, side_bottom, segments),
+        # Bottom
+        fan_faces(bottom_centre, bottom_cap, segments),
+    )).astype(np.int32)
+
+    return vertices, calculate_normals(vertices, indices), indices
+
+def tab_segments(radius: float, line_width: float, max_error: float = 0.25, minimum: int = 8, maximum: int = 120) -> int:
+    """Fewest segments around a circle of radius that keep it within max_error line widths of round.
+
+    A straight segment cuts in r * (1 - cos(pi / n)) from the circle at its middle, so that's solved for n."""
+    tolerance = max_error * line_width
+    if radius <= 0 or tolerance <= 0 or tolerance >= radius:
+        return minimum
+    return min(maximum, max(minimum, math.ceil(math.pi / math.acos(1 - tolerance / radius))))
+
+def open_outline(points: np.ndarray) -> np.ndarray:
+    """XZ points of a closed outline as float64, without the last point if it repeats the first."""
+    points = np.asarray(points, dtype=np.float64)[:, :2]
+    if points.shape[0] > 1 and np.allclose(points[0], points[-1]):
+        points = points[:-1]
+    return points
+
+def turning_angles(points: np.ndarray) -> np.ndarray:
+    """How far the outline turns at each vertex of a closed polygon, in radians."""
+    edges_in = points - np.roll(points, 1, axis=0)
+    edges_out = np.roll(points, -1, axis=0) - points
+    cross = edges_in[:, 0] * edges_out[:, 1] - edges_in[:, 1] * edges_out[:, 0]
+    dot = np.einsum("ij,ij->i", edges_in, edges_out)
+    return np.abs(np.arctan2(cross, dot))
+
+def perimeter_tab_positions(points: np.ndarray, spacing: float, include_corners: bool = True, count: int = 0, corner_angle: float = 35.0) -> np.ndarray:
+    """Evenly spaced positions around a closed outline, measured along the perimeter.
+
+    With include_corners every vertex turning more than corner_angle degrees gets a tab and the stretches between them are
+    filled in evenly, otherwise the spacing starts from the first point. Tabs are at least spacing apart except where a
+    stretch between two corners is shorter than that: corners closer than half the spacing share one tab, so two tabs
+    can be as close as half the spacing. If count is given it replaces spacing (the perimeter over count) and you get
+    exactly that many: the corners still get theirs and the rest are shared out between the stretches by length (largest
+    remainder). If there are more corners than count the corners are ignored and they're just spread evenly."""
+    points = open_outline(points)
+    if points.shape[0] < 2:
+        return points.copy()
+
+    edges = np.roll(points, -1, axis=0) - points
+    edge_lengths = np.hypot(edges[:, 0], edges[:, 1])
+    cumulative = np.concatenate(([0.0], np.cumsum(edge_lengths)))
+    perimeter = cumulative[-1]
+    if perimeter <= 0:
+        return points[:1].copy()
+    if count > 0:
+        spacing = perimeter / count
+    if spacing <= 0:
+        return points[:1].copy()
+
+    anchors = np.zeros(1)
+    if include_corners:
+        corner_distances = cumulative[np.flatnonzero(turning_angles(points) >= math.radians(corner_angle))]
+        if corner_distances.size > 0:
+            # Bevelled corners show up as a couple of sharp vertices right next to each other, they only need one tab
+            kept = [corner_distances[0]]
+            for distance in corner_distances[1:]:
+                if distance - kept[-1] >= spacing * 0.5:
+                    kept.append(distance)
+            if len(kept) > 1 and kept[0] + perimeter - kept[-1] < spacing * 0.5:
+                kept.pop()
+            if count <= 0 or len(kept) <= count:
+                anchors = np.asarray(kept)
+
+    gaps = np.diff(np.append(anchors, anchors[0] + perimeter))
+    if count > 0:
+        # Every stretch starts with its anchor, then it gets its share of what's left by length. Rounding each one on its
+        # own would lose (or gain) a tab or two overall, so the ones rounded down the most get the leftovers.
+        shares = gaps / perimeter * (count - anchors.size)
+        extra = np.floor(shares + 1e-9).astype(np.int64)
+        leftover = count - anchors.size - int(extra.sum())
+        if leftover > 0:
+            extra[np.argsort(extra - shares, kind="stable")[:leftover]] += 1
+        counts = 1 + extra
+    else:
+        # Split each stretch between anchors into as many equal gaps as will fit
+        counts = np.maximum(1, np.floor(gaps / spacing + 1e-9).astype(np.int64))
+    steps_into_gap = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    distances = (np.repeat(anchors, counts) + steps_into_gap * np.repeat(gaps / counts, counts)) % perimeter
+
+    # Find which edge each distance lands on and how far along it
+    edge_index = np.clip(np.searchsorted(cumulative, distances, side="right") - 1, 0, points.shape[0] - 1)
+    safe_lengths = np.where(edge_lengths[edge_index] > 0, edge_lengths[edge_index], 1.0)
+    along = ((distances - cumulative[edge_index]) / safe_lengths)[:, np.newaxis]
+    return points[edge_index] + along * edges[edge_index]
+
+def polygon_centroid(points: np.ndarray) -> np.ndarray:
+    """Centre of the area of a polygon, or the average of its points if it hasn't got any area."""
+    following = np.roll(points, -1, axis=0)
+    cross = points[:, 0] * following[:, 1] - following[:, 0] * points[:, 1]
+    area = cross.sum() * 0.5
+    if abs(area) < 1e-12:
+        return points.mean(axis=0)
+    return ((points + following) * cross[:, np.newaxis]).sum(axis=0) / (6.0 * area)
+
+def warp_risk_scores(points: np.ndarray, window: float) -> np.ndarray:
+    """How likely each vertex of a closed convex outline is to lift off the plate, from 0 to 1.
+
+    Sharpness is how far the outline turns within window along the perimeter around a vertex, so a bevelled or rounded corner
+    counts as much as a pointy one. Turning 90 degrees or more is fully sharp. That gets scaled from half to full by how far
+    the vertex is from the middle compared to the rest of the outline, so the far ends of long thin bases come first."""
+    points = open_outline(points)
+    point_count = points.shape[0]
+    if point_count < 3:
+        return np.ones(point_count)
+
+    angles = turning_angles(points)
+    edge_lengths = np.hypot(*(np.roll(points, -1, axis=0) - points).T)
+    perimeter = edge_lengths.sum()
+    along = np.concatenate(([0.0], np.cumsum(edge_lengths)[:-1]))
+    # Three laps of the outline so windows can run off either end
+    laps_along = np.concatenate((along - perimeter, along, along + perimeter))
+    laps_turned = np.concatenate(([0.0], np.cumsum(np.tile(angles, 3))))
+    half_window = min(window * 0.5, perimeter * 0.5)
+    window_starts = np.searchsorted(laps_along, along - half_window, side="left")
+    window_ends = np.searchsorted(laps_along, along + half_window, side="right")
+    sharpness = np.clip((laps_turned[window_ends] - laps_turned[window_starts]) / (math.pi * 0.5), 0.0, 1.0)
+
+    distances = np.hypot(*(points - polygon_centroid(points)).T)
+    spread = distances.max() - distances.min()
+    # Everything the same distance away (like a regular polygon) is all as far out as it gets
+    reach = (distances - distances.min()) / spread if spread > 1e-9 else np.ones(point_count)
+    return sharpness * (0.5 + 0.5 * reach)
+
+def corner_tab_positions(outlines: list[np.ndarray], spacing: float, threshold: float = 0.5, budget: int = 0) -> np.ndarray:
+    """Tabs only on the vertices most likely to warp, across all of an object's outlines.
+
+    Every vertex scoring at least threshold is a candidate. The best are taken first, skipping any closer than spacing
+    to one already taken, until there are budget of them (0 for no limit)."""
+    candidates = []
+    candidate_scores = []
+    for outline in outlines:
+        points = open_outline(outline)
+        if points.shape[0] == 0:
+            continue
+        scores = warp_risk_scores(points, spacing)
+        keep = scores >= threshold
+        candidates.append(points[keep])
+        candidate_scores.append(scores[keep])
+    if not candidates:
+        return np.zeros((0, 2))
+    candidates = np.concatenate(candidates)
+    candidate_scores = np.concatenate(candidate_scores)
+
+    chosen = np.empty((0, 2))
+    for index in np.argsort(-candidate_scores, kind="stable"):
+        point = candidates[index]
+        if chosen.shape[0] > 0 and np.min(np.hypot(*(chosen - point).T)) < spacing:
+            continue
+        chosen = np.vstack((chosen, point))
+        if budget > 0 and chosen.shape[0] >= budget:
+            break
+    return chosen
+
+def points_in_convex_polygon(polygon: np.ndarray, points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Which points are inside (or within tolerance of the edge of) a convex polygon, whichever way it winds."""
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    edge_lengths = np.hypot(edges[:, 0], edges[:, 1])
+    edge_lengths[edge_lengths == 0] = 1.0
+    relative = points[:, np.newaxis, :] - polygon[np.newaxis, :, :]
+    # Signed distance of every point from every edge's line
+    distances = (edges[np.newaxis, :, 0] * relative[:, :, 1] - edges[np.newaxis, :, 1] * relative[:, :, 0]) / edge_lengths
+    winding = 1.0 if np.sum(edges[:, 0] * (polygon[:, 1] + np.roll(polygon, -1, axis=0)[:, 1])) <= 0 else -1.0
+    return np.all(distances * winding >= -tolerance, axis=1)
+
+def filter_contained_hulls(hulls: list[np.ndarray], tolerance: float = 1e-4) -> list[int]:
+    """Indices of the convex hulls which aren't completely inside another one.
+
+    Bounding boxes rule out most pairs before any points get tested against a hull."""
+    hull_count = len(hulls)
+    if hull_count < 2:
+        return list(range(hull_count))
+
+    hulls = [np.asarray(hull, dtype=np.float64)[:, :2] for hull in hulls]
+    mins = np.array([hull.min(axis=0) for hull in hulls])
+    maxs = np.array([hull.max(axis=0) for hull in hulls])
+    # a can only contain b if a's bounding box contains b's
+    box_contains = (np.all(mins[:, np.newaxis, :] <= mins[np.newaxis, :, :] + tolerance, axis=2)
+                    & np.all(maxs[:, np.newaxis, :] >= maxs[np.newaxis, :, :] - tolerance, axis=2))
+    np.fill_diagonal(box_contains, False)
+
+    areas = np.array([0.5 * abs(np.dot(hull[:, 0], np.roll(hull[:, 1], -1)) - np.dot(hull[:, 1], np.roll(hull[:, 0], -1))) for hull in hulls])
+    contained = np.zeros(hull_count, dtype=bool)
+    # Biggest first. Once a hull is known to be inside another, anything inside it has already been caught by the bigger one.
+    for a in np.argsort(-areas, kind="stable"):
+        if contained[a]:
+            continue
+        candidates = np.flatnonzero(box_contains[a] & ~contained)
+        if candidates.size == 0:
+            continue
+        candidate_points = [hulls[b] for b in candidates]
+        offsets = np.cumsum([0] + [len(points) for points in candidate_points[:-1]])
+        inside = points_in_convex_polygon(hulls[a], np.concatenate(candidate_points), tolerance)
+        contained[candidates[np.logical_and.reduceat(inside, offsets)]] = True
+
+    return np.flatnonzero(~contained).tolist()
+
+class FaceHeightIndex:
+    """The faces of a mesh that start near the bottom, sorted by their lowest point, for slicing it horizontally near the base.
+
+    A slice only has to look at the faces which reach down below it, so taking a few more slices costs hardly anything
+    once the index exists. Only faces starting within reach of the bottom are kept. Heights are measured from the
+    lowest point of the mesh, so the index only depends on the rotation and scale of the mesh, not where it is."""
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, rotation: np.ndarray, reach: float) -> None:
+        self.vertices = vertices
+        self.faces = faces
+        self.rotation = np.asarray(rotation, dtype=np.float64)[:3, :3]
+        self.reach = reach
+
+        # Y after rotating is all that's needed to work out which faces cross a slice
+        y = vertices @ self.rotation[1]
+        self.bottom = float(y.min()) if y.size else 0.0
+        corner_y = [y[faces[:, corner]] for corner in range(3)]
+        face_min = np.minimum(np.minimum(corner_y[0], corner_y[1]), corner_y[2])
+        nearby = np.flatnonzero(face_min <= self.bottom + reach)
+        order = np.argsort(face_min[nearby], kind="stable")
+        self._face_ids = nearby[order]
+        self._face_min = face_min[self._face_ids]
+        self._face_max = np.maximum(np.maximum(corner_y[0][self._face_ids], corner_y[1][self._face_ids]), corner_y[2][self._face_ids])
+
+    def crossing_faces(self, height: float) -> np.ndarray:
+        """Indices of the faces which cross a slice height above the bottom: some of it above, some not."""
+        if height > self.reach:
+            raise ValueError(f"Can't slice at {height} when the index only reaches {self.reach}")
+        plane_y = self.bottom + height
+        # Everything past this starts above the slice
+        end = np.searchsorted(self._face_min, plane_y, side="right")
+        return self._face_ids[:end][self._face_max[:end] > plane_y]
+
+    def section(self, height: float, translation: np.ndarray = None) -> list[np.ndarray]:
+        """Slice height above the bottom, moved by translation, and return the XZ points of each separate outline.
+
+        The outlines aren't put in order around their perimeter, which is fine for taking their convex hull."""
+        crossing = self.crossing_faces(height)
+        if crossing.size == 0:
+            return []
+        translation = np.zeros(3) if translation is None else np.asarray(translation, dtype=np.float64)
+
+        crossing_faces = self.faces[crossing]
+        # Transform only the vertices these faces use
+        used, local_faces = np.unique(crossing_faces, return_inverse=True)
+        local_faces = local_faces.reshape(-1, 3)
+        world = self.vertices[used] @ self.rotation.T + translation
+        plane_y = self.bottom + height + translation[1]
+        crossing_above = world[local_faces, 1] > plane_y
+
+        # Each crossing face has exactly two edges with one end above the plane and one not
+        edge_starts = local_faces
+        edge_ends = np.roll(local_faces, -1, axis=1)
+        edge_crosses = crossing_above != np.roll(crossing_above, -1, axis=1)
+        starts = edge_starts[edge_crosses].reshape(-1, 2)
+        ends = edge_ends[edge_crosses].reshape(-1, 2)
+        # Neighbouring faces share edges, so do the maths the same way round for both to get exactly the same point
+        swap = world[starts, 1] > world[ends, 1]
+        low = np.where(swap, ends, starts)
+        high = np.where(swap, starts, ends)
+        low_points = world[low]
+        high_points = world[high]
+        along = (plane_y - low_points[..., 1]) / (high_points[..., 1] - low_points[..., 1])
+        segment_points = low_points[..., [0, 2]] + along[..., np.newaxis] * (high_points[..., [0, 2]] - low_points[..., [0, 2]])
+
+        # Join up segments that share an end into separate outlines
+        _, point_ids = np.unique(np.round(segment_points.reshape(-1, 2) / 1e-5), axis=0, return_inverse=True)
+        point_ids = point_ids.reshape(-1, 2)
+        point_count = point_ids.max() + 1
+        graph = coo_matrix((np.ones(point_ids.shape[0]), (point_ids[:, 0], point_ids[:, 1])), shape=(point_count, point_count))
+        outline_count, outline_of_point = connected_components(graph, directed=False)
+
+        flat_points = segment_points.reshape(-1, 2)
+        flat_ids = point_ids.reshape(-1)
+        order = np.argsort(outline_of_point[flat_ids], kind="stable")
+        splits = np.searchsorted(outline_of_point[flat_ids][order], np.arange(1, outline_count))
+        return np.split(flat_points[order], splits)
+
+def section_base(vertices: np.ndarray, faces: np.ndarray, transformation: np.ndarray, height: float) -> list[np.ndarray]:
+    """Cut a mesh horizontally height above its lowest point and return the XZ points of each separate outline.
+
+    Only the faces which cross the plane get transformed and intersected, so the rest of the mesh is never copied."""
+    return FaceHeightIndex(vertices, faces, transformation[:3, :3], height).section(height, transformation[:3, 3])
+
+def compute_base_hulls(vertices: np.ndarray, indices: np.ndarray, transformation: np.ndarray, heights: float | Sequence[float],
+                       index: FaceHeightIndex = None) -> list[np.ndarray]:
+    """Convex hulls of each separate part of a mesh's base, leaving out any inside another.
+
+    With more than one height, the base is everything touched by a slice at any of them, with hulls that overlap
+    joined into one. Pass in an index from before (with the same rotation and scale) to skip building one.
+    Only uses the arrays it's given so it's safe to run off the main thread."""
+    heights = np.atleast_1d(np.asarray(heights, dtype=np.float64))
+    if index is None or index.reach < heights.max():
+        index = FaceHeightIndex(vertices, indices, transformation[:3, :3], float(heights.max()))
+    hulls = []
+    for height in heights:
+        for outline in index.section(float(height), transformation[:3, 3]):
+            hull_points = convex_hull_points(outline)
+            if hull_points is not None:
+                hulls.append(hull_points)
+    if len(heights) > 1:
+        hulls = merge_overlapping_hulls(hulls)
+    return [hulls[i] for i in filter_contained_hulls(hulls)]
+
+def convex_polygons_overlap(a: np.ndarray, b: np.ndarray, tolerance: float = 1e-6) -> bool:
+    """Whether two convex polygons overlap (or touch), by looking for an edge of either one that separates them."""
+    # Slices of the same part at different heights usually have their middles inside each other, which is much quicker to check
+    if points_in_convex_polygon(a, b.mean(axis=0)[np.newaxis], tolerance)[0] or points_in_convex_polygon(b, a.mean(axis=0)[np.newaxis], tolerance)[0]:
+        return True
+    for polygon in (a, b):
+        edges = np.roll(polygon, -1, axis=0) - polygon
+        normals = np.column_stack((-edges[:, 1], edges[:, 0]))
+        a_projected = a @ normals.T
+        b_projected = b @ normals.T
+        if np.any((a_projected.max(axis=0) < b_projected.min(axis=0) - tolerance) | (b_projected.max(axis=0) < a_projected.min(axis=0) - tolerance)):
+            return False
+    return True
+
+def merge_overlapping_hulls(hulls: list[np.ndarray]) -> list[np.ndarray]:
+    """Replace each group of convex hulls that overlap each other with the convex hull of the lot."""
+    hull_count = len(hulls)
+    if hull_count < 2:
+        return list(hulls)
+
+    hulls = [np.asarray(hull, dtype=np.float64)[:, :2] for hull in hulls]
+    mins = np.array([hull.min(axis=0) for hull in hulls])
+    maxs = np.array([hull.max(axis=0) for hull in hulls])
+    # Only pairs with overlapping bounding boxes need a proper look
+    box_overlaps = np.all((mins[:, np.newaxis, :] <= maxs[np.newaxis, :, :]) & (maxs[:, np.newaxis, :] >= mins[np.newaxis, :, :]), axis=2)
+    first, second = np.nonzero(np.triu(box_overlaps, k=1))
+    touching = [(a, b) for a, b in zip(first.tolist(), second.tolist()) if convex_polygons_overlap(hulls[a], hulls[b])]
+    if not touching:
+        return hulls
+
+    pairs = np.array(touching)
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(hull_count, hull_count))
+    group_count, group_of_hull = connected_components(graph, directed=False)
+    merged = []
+    for group in range(group_count):
+        members = np.flatnonzero(group_of_hull == group)
+        if members.size == 1:
+            merged.append(hulls[members[0]])
+            continue
+        hull_points = convex_hull_points(np.concatenate([hulls[i] for i in members]))
+        if hull_points is not None:
+            merged.append(hull_points)
+    return merged
+
+def convex_hull_points(points: np.ndarray) -> np.ndarray:
+    """Points of the 2D convex hull of some points, or None if they don't make a proper shape."""
+    if points.shape[0] < 3:
+        return None
+    try:
+        hull = ConvexHull(points)
+    except QhullError:
+        return None
+    return points[hull.vertices]
+
+def circle_hits_polygon(polygon: np.ndarray, x: float, z: float, radius: float) -> bool:
+    """Whether a circle overlaps a convex polygon at all."""
+    centre = np.array([[x, z]])
+    if points_in_convex_polygon(polygon, centre, 0.0)[0]:
+        return True
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    edge_lengths_squared = np.einsum("ij,ij->i", edges, edges)
+    edge_lengths_squared[edge_lengths_squared == 0] = 1.0
+    along = np.clip(np.einsum("ij,ij->i", centre - polygon, edges) / edge_lengths_squared, 0.0, 1.0)
+    closest = polygon + along[:, np.newaxis] * edges
+    return bool(np.min(np.hypot(closest[:, 0] - x, closest[:, 1] - z)) < radius)
+
+def ray_mesh_distance(origin: np.ndarray, direction: np.ndarray, vertices: np.ndarray, faces: np.ndarray, chunk_size: int = 262144) -> float:
+    """How many directions along a ray it first hits a triangle of a mesh (either side of it), or None if it doesn't.
+
+    Möller-Trumbore on every face at once, a chunk at a time so huge meshes don't need huge temporary arrays.
+    The ray can be in the mesh's own coordinates, since the distance comes out the same after an affine transformation."""
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    nearest = math.inf
+    for start in range(0, faces.shape[0], chunk_size):
+        chunk = faces[start:start + chunk_size]
+        v0 = vertices[chunk[:, 0]].astype(np.float64)
+        edge1 = vertices[chunk[:, 1]] - v0
+        edge2 = vertices[chunk[:, 2]] - v0
+        p = np.cross(direction, edge2)
+        determinant = np.einsum("ij,ij->i", edge1, p)
+        usable = np.abs(determinant) > 1e-12  # Faces edge on to the ray (or with no area) can't be hit
+        inverse = np.zeros_like(determinant)
+        inverse[usable] = 1.0 / determinant[usable]
+        to_origin = origin - v0
+        u = np.einsum("ij,ij->i", to_origin, p) * inverse
+        q = np.cross(to_origin, edge1)
+        v = (q @ direction) * inverse
+        t = np.einsum("ij,ij->i", edge2, q) * inverse
+        hits = usable & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t > 1e-9)
+        if np.any(hits):
+            nearest = min(nearest, float(t[hits].min()))
+    return nearest if nearest < math.inf else None
+
+class MeshRayCaster:
+    """Casts rays at one mesh, in its own coordinates.
+
+    Faces are sorted so ones near each other end up next to each other, then grouped into clusters with a bounding
+    sphere each. A ray only looks at the faces in clusters it passes through, and only does the full test on the
+    faces it passes close to."""
+
+    CLUSTER_SIZE = 64
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray) -> None:
+        self.vertices = vertices
+        corners = [vertices[faces[:, corner]] for corner in range(3)]
+        centres = (corners[0] + corners[1] + corners[2]) / 3.0
+        radii = np.sqrt(np.max([np.einsum("ij,ij->i", corner - centres, corner - centres) for corner in corners], axis=0))
+
+        # Z-order the faces by where they are so each cluster is a compact blob, not a long sliver
+        order = np.argsort(_morton_codes(centres), kind="stable")
+        self.faces = faces[order]
+        self._centres = centres[order]
+        self._radii_squared = radii[order] ** 2
+
+        # Each cluster's sphere goes around the box around its faces' spheres
+        starts = np.arange(0, self.faces.shape[0], self.CLUSTER_SIZE)
+        self._cluster_starts = starts
+        sorted_radii = radii[order][:, np.newaxis]
+        low = np.minimum.reduceat(self._centres - sorted_radii, starts, axis=0)
+        high = np.maximum.reduceat(self._centres + sorted_radii, starts, axis=0)
+        self._cluster_centres = (low + high) / 2
+        self._cluster_radii_squared = np.einsum("ij,ij->i", high - low, high - low) / 4
+
+    @staticmethod
+    def _sphere_candidates(origin: np.ndarray, unit: np.ndarray, centres: np.ndarray, radii_squared: np.ndarray) -> np.ndarray:
+        """Which spheres the ray goes through, ignoring ones entirely behind it."""
+        relative = centres - origin
+        along = relative @ unit
+        squared_miss = np.einsum("ij,ij->i", relative, relative) - along * along
+        return np.flatnonzero((squared_miss <= radii_squared) & ((along >= 0) | (along * along <= radii_squared)))
+
+    def distance(self, origin: np.ndarray, direction: np.ndarray) -> float:
+        """How many directions along the ray it first hits the mesh, or None if it misses."""
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        length = np.linalg.norm(direction)
+        if length == 0 or self.faces.shape[0] == 0:
+            return None
+        unit = direction / length
+
+        clusters = self._sphere_candidates(origin, unit, self._cluster_centres, self._cluster_radii_squared)
+        if clusters.size == 0:
+            return None
+        face_ids = (self._cluster_starts[clusters][:, np.newaxis] + np.arange(self.CLUSTER_SIZE)).ravel()
+        face_ids = face_ids[face_ids < self.faces.shape[0]]
+        nearby = face_ids[self._sphere_candidates(origin, unit, self._centres[face_ids], self._radii_squared[face_ids])]
+        if nearby.size == 0:
+            return None
+        return ray_mesh_distance(origin, direction, self.vertices, self.faces[nearby])
+
+# Each 10 bit number with two zero bits put between each of its bits, for building Morton codes without looping over bits
+_MORTON_SPREAD = np.zeros(1024, dtype=np.uint32)
+for _bit in range(10):
+    _MORTON_SPREAD |= ((np.arange(1024, dtype=np.uint32) >> _bit) & 1) << (3 * _bit)
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Interleaved bits of each point's position in a grid over their bounding box, for sorting them along a Z-order curve."""
+    low = points.min(axis=0)
+    size = np.maximum(points.max(axis=0) - low, 1e-9)
+    cells = ((points - low) * (1023 / size)).astype(np.int32)
+    return _MORTON_SPREAD[cells[:, 0]] | (_MORTON_SPREAD[cells[:, 1]] << 1) | (_MORTON_SPREAD[cells[:, 2]] << 2)
+
+class TabSpatialHash:
+    """Uniform grid over the build plate (X/Z) for finding tabs and object bases near a point without checking all of them.
+
+    Tabs and outlines go in under a key (like the id of their node) so they can be swapped out or taken out again
+    when that node changes, without building the whole thing again."""
+
+    def __init__(self, cell_size: float) -> None:
+        self._cell_size: float = max(cell_size, 0.1)
+        self._tab_cells: dict[tuple[int, int], dict[object, list[tuple[float, float]]]] = {}
+        self._tab_keys: dict[object, set[tuple[int, int]]] = {}  # Which cells each key has tabs in
+        self._outline_cells: dict[tuple[int, int], set[int]] = {}
+        self._outlines: dict[int, tuple[object, np.ndarray, list[tuple[int, int]]]] = {}  # (owner, points, cells) by index
+        self._owner_outlines: dict[object, list[int]] = {}
+        self._next_outline: int = 0
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    def _cells(self, min_x: float, min_z: float, max_x: float, max_z: float):
+        size = self._cell_size
+        for cell_x in range(math.floor(min_x / size), math.floor(max_x / size) + 1):
+            for cell_z in range(math.floor(min_z / size), math.floor(max_z / size) + 1):
+                yield (cell_x, cell_z)
+
+    def add_tab(self, x: float, z: float, key: object = None) -> None:
+        cell = (math.floor(x / self._cell_size), math.floor(z / self._cell_size))
+        self._tab_cells.setdefault(cell, {}).setdefault(key, []).append((x, z))
+        self._tab_keys.setdefault(key, set()).add(cell)
+
+    def set_tabs(self, key: object, points) -> None:
+        """Replace whatever tabs were under key with these (x, z) points."""
+        self.remove_tabs(key)
+        for x, z in points:
+            self.add_tab(x, z, key)
+
+    def remove_tabs(self, key: object) -> None:
+        for cell in self._tab_keys.pop(key, ()):
+            cell_tabs = self._tab_cells[cell]
+            del cell_tabs[key]
+            if not cell_tabs:
+                del self._tab_cells[cell]
+
+    def add_outline(self, owner: object, points: np.ndarray) -> None:
+        """Add the base outline of an object. Owner is anything that identifies the object, so its own tabs can ignore it."""
+        points = np.asarray(points, dtype=np.float64)[:, :2]
+        index = self._next_outline
+        self._next_outline += 1
+        min_x, min_z = points.min(axis=0)
+        max_x, max_z = points.max(axis=0)
+        cells = list(self._cells(min_x, min_z, max_x, max_z))
+        self._outlines[index] = (owner, points, cells)
+        self._owner_outlines.setdefault(owner, []).append(index)
+        for cell in cells:
+            self._outline_cells.setdefault(cell, set()).add(index)
+
+    def set_outlines(self, owner: object, outlines) -> None:
+        """Replace all of an object's outlines. Anything with less than three points gets left out."""
+        self.remove_outlines(owner)
+        for points in outlines:
+            if points is not None and len(points) >= 3:
+                self.add_outline(owner, points)
+
+    def remove_outlines(self, owner: object) -> None:
+        for index in self._owner_outlines.pop(owner, ()):
+            _, _, cells = self._outlines.pop(index)
+            for cell in cells:
+                cell_outlines = self._outline_cells[cell]
+                cell_outlines.discard(index)
+                if not cell_outlines:
+                    del self._outline_cells[cell]
+
+    def tab_near(self, x: float, z: float, distance: float, ignore = ()) -> bool:
+        """Whether there's a tab centred closer than distance to a point, not counting any added under a key in ignore."""
+        for cell in self._cells(x - distance, z - distance, x + distance, z + distance):
+            for key, tabs in self._tab_cells.get(cell, {}).items():
+                if key in ignore:
+                    continue
+                for tab_x, tab_z in tabs:
+                    if math.hypot(tab_x - x, tab_z - z) < distance:
+                        return True
+        return False
+
+    def outline_hit(self, x: float, z: float, radius: float, owner: object) -> bool:
+        """Whether a circle would run into the base of any object except owner."""
+        checked = set()
+        for cell in self._cells(x - radius, z - radius, x + radius, z + radius):
+            for index in self._outline_cells.get(cell, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                outline_owner, points, _ = self._outlines[index]
+                if outline_owner != owner and circle_hits_polygon(points, x, z, radius):
+                    return True
+        return False
@@ -0,0 +1,210 @@
+#--------------------------------------------------------------------------------------------
+# Tab Anti-Warping Reborn by Slashee the Cow copyright 2025-
+#
+# Micro-benchmarks for TabGeometry on synthetic meshes. Doesn't need Cura, just NumPy and SciPy.
+#
+#   python benchmarks/bench_geometry.py              Full run, meshes up to 5M triangles
+#   python benchmarks/bench_geometry.py --quick      Small sizes only, what CI runs
+#   python benchmarks/bench_geometry.py --json out.json
+#   python benchmarks/bench_geometry.py --baseline out.json --tolerance 2
+#                                                    Fail if anything got more than twice as slow
+#   python benchmarks/bench_geometry.py --quick --baseline benchmarks/baseline.json --tolerance 3
+#                                                    What CI runs, against the committed baseline
+#
+# benchmarks/test_geometry.py checks the answers are still right: python -m pytest benchmarks
+#--------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import TabGeometry  # noqa: E402  (needs the path set up first)
+
+#----------------------------------------
+# Synthetic meshes
+#----------------------------------------
+
+def tube_mesh(outer_radius: float, inner_radius: float, height: float, segments: int, stacks: int, centre: tuple[float, float] = (0.0, 0.0)) -> tuple[np.ndarray, np.ndarray]:
+    """A tube (or a solid cylinder with inner_radius 0) standing on y = 0, as shared-vertex triangles.
+
+    Roughly 4 * segments * stacks triangles for a tube, half that for a cylinder."""
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    heights = np.linspace(0, height, stacks + 1)
+    walls = [outer_radius] if inner_radius <= 0 else [outer_radius, inner_radius]
+
+    vertices = []
+    faces = []
+    offset = 0
+    ring = np.arange(segments)
+    next_ring = (ring + 1) % segments
+    for wall, radius in enumerate(walls):
+        x = np.tile(radius * np.cos(angles) + centre[0], stacks + 1)
+        z = np.tile(radius * np.sin(angles) + centre[1], stacks + 1)
+        y = np.repeat(heights, segments)
+        vertices.append(np.column_stack((x, y, z)))
+        rows = (np.arange(stacks) * segments)[:, np.newaxis]
+        a = offset + rows + ring
+        b = offset + rows + next_ring
+        c = a + segments
+        d = b + segments
+        wall_faces = np.concatenate((np.stack((a, d, b), axis=-1), np.stack((a, c, d), axis=-1)), axis=1).reshape(-1, 3)
+        faces.append(wall_faces if wall == 0 else wall_faces[:, ::-1])
+        offset += segments * (stacks + 1)
+
+    if len(walls) == 1:
+        # Fan caps on a solid cylinder
+        centres = np.array([[centre[0], 0.0, centre[1]], [centre[0], height, centre[1]]])
+        vertices.append(centres)
+        bottom = np.column_stack((np.full(segments, offset), next_ring, ring))
+        top = np.column_stack((np.full(segments, offset + 1), stacks * segments + ring, stacks * segments + next_ring))
+        faces.extend((bottom, top))
+    else:
+        # Annulus caps joining the outer and inner walls
+        inner = segments * (stacks + 1)
+        for level in (0, stacks):
+            outer_row = level * segments
+            inner_row = inner + level * segments
+            a = outer_row + ring
+            b = outer_row + next_ring
+            c = inner_row + ring
+            d = inner_row + next_ring
+            cap = np.concatenate((np.column_stack((a, b, d)), np.column_stack((a, d, c))))
+            faces.append(cap if level == stacks else cap[:, ::-1])
+
+    return np.concatenate(vertices).astype(np.float32), np.concatenate(faces).astype(np.int32)
+
+def cylinder_with_triangles(triangles: int) -> tuple[np.ndarray, np.ndarray]:
+    """A single tall cylinder with about this many triangles."""
+    segments = max(8, int(math.sqrt(triangles / 2)))
+    stacks = max(1, int(triangles / (2 * segments)))
+    return tube_mesh(40.0, 0.0, 80.0, segments, stacks)
+
+def island_plate(islands: int, segments: int = 48) -> tuple[np.ndarray, np.ndarray]:
+    """A grid of separate tubes. Each one's base has an outer and an inner outline, so half the outlines are nested."""
+    columns = math.ceil(math.sqrt(islands))
+    meshes = []
+    offset = 0
+    for i in range(islands):
+        vertices, faces = tube_mesh(3.0, 1.5, 5.0, segments, 2, ((i % columns) * 8.0, (i // columns) * 8.0))
+        meshes.append((vertices, faces + offset))
+        offset += vertices.shape[0]
+    return np.concatenate([m[0] for m in meshes]), np.concatenate([m[1] for m in meshes])
+
+def dense_outline(points: int) -> np.ndarray:
+    """A wobbly closed outline with lots of vertices, like a hull off a finely tessellated part."""
+    angles = np.linspace(0, 2 * np.pi, points, endpoint=False)
+    radius = 60 + 5 * np.sin(angles * 7)
+    return np.column_stack((radius * np.cos(angles), radius * np.sin(angles)))
+
+#----------------------------------------
+# Measuring
+#----------------------------------------
+
+def measure(function: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Best wall clock time in seconds over repeat runs, and peak traced memory in MB of one more run."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    # Separate run because tracing slows things down
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+def run_benchmarks(quick: bool, repeat: int) -> list[dict]:
+    identity = np.eye(4)
+    results = []
+
+    def record(name: str, size: str, function: Callable[[], object]) -> None:
+        seconds, peak_mb = measure(function, repeat)
+        results.append({"name": name, "size": size, "seconds": seconds, "peak_mb": peak_mb})
+        print(f"{name:<28}{size:>14}{seconds * 1000:>12.2f} ms{peak_mb:>12.1f} MB", flush=True)
+
+    print(f"{'benchmark':<28}{'size':>14}{'time':>15}{'peak memory':>15}")
+
+    # Slicing big meshes
+    for triangles in ((10_000, 100_000) if quick else (10_000, 100_000, 1_000_000, 5_000_000)):
+        vertices, faces = cylinder_with_triangles(triangles)
+        record("section_base", f"{faces.shape[0]} tris", lambda: TabGeometry.section_base(vertices, faces, identity, 0.2))
+        record("base_hulls_5_layers", f"{faces.shape[0]} tris", lambda: TabGeometry.compute_base_hulls(vertices, faces, identity, (0.1, 0.3, 0.5, 0.7, 0.9)))
+
+    # Clicking on big meshes, a straight down ray and a glancing one from the side
+    for triangles in ((100_000,) if quick else (100_000, 1_000_000, 5_000_000)):
+        vertices, faces = cylinder_with_triangles(triangles)
+        record("ray_caster_build", f"{faces.shape[0]} tris", lambda: TabGeometry.MeshRayCaster(vertices, faces))
+        ray_caster = TabGeometry.MeshRayCaster(vertices, faces)
+        record("ray_caster_distance", f"{faces.shape[0]} tris", lambda: (ray_caster.distance(np.array([10.0, 200.0, 5.0]), np.array([0.0, -1.0, 0.0])),
+                                                                           ray_caster.distance(np.array([-200.0, 40.0, 3.0]), np.array([1.0, -0.1, 0.0]))))
+
+    # Lots of islands
+    for islands in ((50, 200) if quick else (50, 200, 500)):
+        vertices, faces = island_plate(islands)
+        outlines = TabGeometry.section_base(vertices, faces, identity, 0.2)
+        hulls = [TabGeometry.convex_hull_points(outline) for outline in outlines]
+        hulls = [hull for hull in hulls if hull is not None]
+        record("convex_hull_points", f"{len(outlines)} outlines", lambda: [TabGeometry.convex_hull_points(outline) for outline in outlines])
+        record("filter_contained_hulls", f"{len(hulls)} hulls", lambda: TabGeometry.filter_contained_hulls(hulls))
+        record("compute_base_hulls", f"{islands} islands", lambda: TabGeometry.compute_base_hulls(vertices, faces, identity, 0.2))
+
+    # Placing tabs around a detailed outline
+    for points in ((1_000, 10_000) if quick else (1_000, 10_000, 100_000)):
+        outline = dense_outline(points)
+        record("perimeter_tab_positions", f"{points} points", lambda: TabGeometry.perimeter_tab_positions(outline, 5.0))
+        record("corner_tab_positions", f"{points} points", lambda: TabGeometry.corner_tab_positions([outline], 5.0, 0.5, 8))
+
+    # Tab meshes
+    record("create_cylinder_mesh", "36 segments", lambda: TabGeometry.create_cylinder_mesh(10.0, 36, 0.56))
+    record("create_dish_mesh", "36 segments", lambda: TabGeometry.create_dish_mesh(10.0, 36, 0.36, 0.48, 1))
+
+    return results
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Anything that's got slower than the baseline by more than tolerance times."""
+    previous = {(entry["name"], entry["size"]): entry["seconds"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["name"], entry["size"]))
+        # Ignore anything too quick to time reliably
+        if before is not None and entry["seconds"] > max(before, 1e-3) * tolerance:
+            regressions.append(f"{entry['name']} ({entry['size']}): {before * 1000:.2f} ms -> {entry['seconds'] * 1000:.2f} ms")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Tab Anti-Warping Reborn's geometry without Cura.")
+    parser.add_argument("--quick", action="store_true", help="only run the small sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the best is reported")
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="how many times slower than the baseline counts as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick, max(1, args.repeat))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        if regressions:
+            print("\nSlower than the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+#--------------------------------------------------------------------------------------------
+# Tab Anti-Warping Reborn by Slashee the Cow copyright 2025-
+#
+# Checks that TabGeometry still gets the right answers, run alongside the benchmarks so nothing gets quicker by
+# getting wrong. Doesn't need Cura, just NumPy, SciPy and pytest.
+#
+#   python -m pytest benchmarks/test_geometry.py
+#--------------------------------------------------------------------------------------------
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import TabGeometry  # noqa: E402  (needs the path set up first)
+from bench_geometry import tube_mesh  # noqa: E402
+
+def cube_mesh(size: float) -> tuple[np.ndarray, np.ndarray]:
+    """A cube sitting on y = 0 with one corner at the origin, wound outwards."""
+    vertices = np.array([[x, y, z] for x in (0, size) for y in (0, size) for z in (0, size)], dtype=np.float32)
+    faces = np.array([
+        [0, 2, 6], [0, 6, 4],  # z = 0
+        [1, 5, 7], [1, 7, 3],  # z = size
+        [0, 1, 3], [0, 3, 2],  # x = 0
+        [4, 6, 7], [4, 7, 5],  # x = size
+        [0, 4, 5], [0, 5, 1],  # y = 0
+        [2, 3, 7], [2, 7, 6],  # y = size
+    ], dtype=np.int32)
+    return vertices, faces
+
+def test_section_cube() -> None:
+    vertices, faces = cube_mesh(10.0)
+    transformation = np.identity(4)
+    transformation[:3, 3] = (5.0, 0.0, -3.0)
+    outlines = TabGeometry.section_base(vertices, faces, transformation, 0.2)
+    assert len(outlines) == 1
+    outline = TabGeometry.open_outline(outlines[0])
+    # Every point is on the edge of the moved square
+    assert np.allclose(outline.min(axis=0), (5.0, -3.0))
+    assert np.allclose(outline.max(axis=0), (15.0, 7.0))
+    on_edge = np.isclose(outline[:, 0], 5.0) | np.isclose(outline[:, 0], 15.0) | np.isclose(outline[:, 1], -3.0) | np.isclose(outline[:, 1], 7.0)
+    assert on_edge.all()
+
+def test_section_cube_hull() -> None:
+    vertices, faces = cube_mesh(10.0)
+    hulls = TabGeometry.compute_base_hulls(vertices, faces, np.identity(4), 0.2)
+    assert len(hulls) == 1
+    assert np.allclose(sorted(map(tuple, hulls[0].round(6))), [(0, 0), (0, 10), (10, 0), (10, 10)])
+
+def test_containment_either_winding() -> None:
+    square = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    points = np.array([[5.0, 5.0], [0.0, 5.0], [11.0, 5.0], [5.0, -0.5]])
+    expected = [True, True, False, False]
+    assert TabGeometry.points_in_convex_polygon(square, points, 1e-6).tolist() == expected
+    assert TabGeometry.points_in_convex_polygon(square[::-1], points, 1e-6).tolist() == expected
+
+def test_filter_contained_hulls_either_winding() -> None:
+    outer = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    inner = np.array([[2.0, 2.0], [4.0, 2.0], [4.0, 4.0], [2.0, 4.0]])
+    apart = inner + 20.0
+    for outer_winding in (outer, outer[::-1]):
+        for inner_winding in (inner, inner[::-1]):
+            assert TabGeometry.filter_contained_hulls([inner_winding, outer_winding, apart]) == [1, 2]
+
+def test_ray_caster_matches_brute_force() -> None:
+    vertices, faces = tube_mesh(20.0, 15.0, 30.0, 96, 24)
+    vertices = vertices.astype(np.float32)
+    caster = TabGeometry.MeshRayCaster(vertices, faces)
+    rng = np.random.default_rng(7)
+    origins = np.column_stack((rng.uniform(-60, 60, 200), rng.uniform(5, 60, 200), rng.uniform(-60, 60, 200)))
+    # Aim near the tube so most of them hit, some from inside the hole
+    targets = np.column_stack((rng.uniform(-25, 25, 200), rng.uniform(0, 30, 200), rng.uniform(-25, 25, 200)))
+    hits = 0
+    for origin, target in zip(origins, targets):
+        direction = (target - origin) / np.linalg.norm(target - origin)
+        expected = TabGeometry.ray_mesh_distance(origin, direction, vertices, faces)
+        actual = caster.distance(origin, direction)
+        if expected is None:
+            assert actual is None
+        else:
+            hits += 1
+            assert actual is not None and abs(actual - expected) < 1e-4
+    assert hits > 50
+
+def test_ray_caster_misses() -> None:
+    vertices, faces = cube_mesh(10.0)
+    caster = TabGeometry.MeshRayCaster(vertices, faces)
+    assert caster.distance(np.array([5.0, 20.0, 5.0]), np.array([0.0, 1.0, 0.0])) is None
+    assert abs(caster.distance(np.array([5.0, 20.0, 5.0]), np.array([0.0, -1.0, 0.0])) - 10.0) < 1e-5
+
+#----------------------------------------
+# Spacing tabs around an outline
+#----------------------------------------
+
+RECTANGLE = np.array([[0.0, 0.0], [100.0, 0.0], [100.0, 50.0], [0.0, 50.0]])
+
+def along_rectangle(points: np.ndarray) -> np.ndarray:
+    """How far around RECTANGLE (anticlockwise from the origin) each point is, sorted."""
+    x, z = points[:, 0], points[:, 1]
+    distances = np.select([np.isclose(z, 0.0), np.isclose(x, 100.0), np.isclose(z, 50.0)],
+                          [x, 100.0 + z, 150.0 + (100.0 - x)], 250.0 + (50.0 - z))
+    return np.sort(distances % 300.0)
+
+def gaps_around(distances: np.ndarray, perimeter: float) -> np.ndarray:
+    return np.diff(np.append(distances, distances[0] + perimeter))
+
+def test_perimeter_count_is_exact() -> None:
+    for include_corners in (True, False):
+        for count in range(1, 31):
+            positions = TabGeometry.perimeter_tab_positions(RECTANGLE, 5.0, include_corners, count)
+            assert positions.shape == (count, 2), (include_corners, count)
+            assert len(np.unique(positions.round(6), axis=0)) == count
+
+def test_perimeter_count_keeps_corners() -> None:
+    for count in (4, 5, 7, 9, 13):
+        positions = TabGeometry.perimeter_tab_positions(RECTANGLE, 5.0, True, count)
+        for corner in RECTANGLE:
+            assert np.min(np.hypot(*(positions - corner).T)) < 1e-6, count
+
+def test_perimeter_count_without_corners_is_even() -> None:
+    positions = TabGeometry.perimeter_tab_positions(RECTANGLE, 5.0, False, 7)
+    assert np.allclose(gaps_around(along_rectangle(positions), 300.0), 300.0 / 7)
+
+def test_perimeter_spacing() -> None:
+    for include_corners in (True, False):
+        positions = TabGeometry.perimeter_tab_positions(RECTANGLE, 20.0, include_corners)
+        gaps = gaps_around(along_rectangle(positions), 300.0)
+        assert np.all(gaps >= 20.0 - 1e-6)
+        # Spread evenly, so never as much as twice the spacing
+        assert np.all(gaps < 40.0)
+    # 100 and 50 both split into 20s exactly, so that's one every 20 with a tab on every corner
+    assert len(TabGeometry.perimeter_tab_positions(RECTANGLE, 20.0, True)) == 14
+
+def test_perimeter_closed_outline() -> None:
+    closed = np.vstack((RECTANGLE, RECTANGLE[:1]))
+    for spacing, count in ((20.0, 0), (5.0, 7)):
+        assert np.allclose(TabGeometry.perimeter_tab_positions(closed, spacing, True, count),
+                           TabGeometry.perimeter_tab_positions(RECTANGLE, spacing, True, count))
+
+def test_perimeter_reversed_winding() -> None:
+    for include_corners, count in ((True, 0), (False, 0), (True, 7), (False, 9)):
+        forwards = TabGeometry.perimeter_tab_positions(RECTANGLE, 20.0, include_corners, count)
+        backwards = TabGeometry.perimeter_tab_positions(RECTANGLE[::-1], 20.0, include_corners, count)
+        assert len(forwards) == len(backwards)
+        gaps = gaps_around(along_rectangle(backwards), 300.0)
+        if count == 0:
+            assert np.all(gaps >= 20.0 - 1e-6)
+        elif not include_corners:
+            assert np.allclose(gaps, 300.0 / count)
+        if include_corners:
+            for corner in RECTANGLE:
+                assert np.min(np.hypot(*(backwards - corner).T)) < 1e-6
+
+def test_perimeter_bevelled_corners_share_a_tab() -> None:
+    # A 1mm bevel on each corner of the rectangle is two sharp vertices right next to each other
+    bevelled = np.array([[1.0, 0.0], [99.0, 0.0], [100.0, 1.0], [100.0, 49.0], [99.0, 50.0], [1.0, 50.0], [0.0, 49.0], [0.0, 1.0]])
+    positions = TabGeometry.perimeter_tab_positions(bevelled, 20.0, True)
+    distances = np.hypot(*(positions - np.roll(positions, -1, axis=0)).T)
+    assert np.all(distances >= 10.0 - 1e-6)
+
+def test_perimeter_degenerate_outlines() -> None:
+    assert TabGeometry.perimeter_tab_positions(np.zeros((0, 2)), 5.0).shape == (0, 2)
+    assert np.allclose(TabGeometry.perimeter_tab_positions(np.array([[3.0, 4.0]]), 5.0), [[3.0, 4.0]])
+    # Every point in the same place, so there's no perimeter to go round
+    assert np.allclose(TabGeometry.perimeter_tab_positions(np.full((4, 2), 2.0), 5.0), [[2.0, 2.0]])
+    assert np.allclose(TabGeometry.perimeter_tab_positions(np.full((4, 2), 2.0), 5.0, True, 6), [[2.0, 2.0]])
+    # A repeated point is a zero length edge, which mustn't divide by zero
+    repeated = np.array([[0.0, 0.0], [100.0, 0.0], [100.0, 0.0], [100.0, 50.0], [0.0, 50.0]])
+    positions = TabGeometry.perimeter_tab_positions(repeated, 20.0, True)
+    assert np.all(np.isfinite(positions)) and len(positions) == 14
+    assert TabGeometry.perimeter_tab_positions(RECTANGLE, 0.0).shape == (1, 2)
+
+#----------------------------------------
+# Tabs only where warping is likely
+#----------------------------------------
+
+def dense_rectangle(width: float, depth: float, step: float) -> np.ndarray:
+    """A rectangle with a point every step along its edges, like a sectioned base would have."""
+    along_x = np.arange(0.0, width, step)
+    along_z = np.arange(0.0, depth, step)
+    return np.vstack((np.column_stack((along_x, np.zeros_like(along_x))), np.column_stack((np.full_like(along_z, width), along_z)),
+                      np.column_stack((width - along_x, np.full_like(along_x, depth))), np.column_stack((np.zeros_like(along_z), depth - along_z))))
+
+def circle(radius: float, segments: int) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    return np.column_stack((radius * np.cos(angles), radius * np.sin(angles)))
+
+def test_warp_risk_rectangle_corners() -> None:
+    scores = TabGeometry.warp_risk_scores(RECTANGLE, 10.0)
+    assert np.allclose(scores, 1.0)
+    positions = TabGeometry.corner_tab_positions([dense_rectangle(100.0, 50.0, 5.0)], 10.0)
+    assert len(positions) == 4
+    assert np.allclose(sorted(map(tuple, positions)), sorted(map(tuple, RECTANGLE)))
+
+def test_warp_risk_straight_edges_score_nothing() -> None:
+    outline = dense_rectangle(100.0, 50.0, 5.0)
+    scores = TabGeometry.warp_risk_scores(outline, 10.0)
+    # More than a window away from any corner is dead straight
+    corner_distance = np.min([np.hypot(*(outline - corner).T) for corner in RECTANGLE], axis=0)
+    assert np.all(scores[corner_distance > 5.0] == 0.0)
+    assert np.all((scores >= 0.0) & (scores <= 1.0))
+
+def test_warp_risk_circle_gets_no_corners() -> None:
+    outline = circle(20.0, 64)
+    assert TabGeometry.warp_risk_scores(outline, 10.0).max() < 0.5
+    assert len(TabGeometry.corner_tab_positions([outline], 10.0)) == 0
+
+def test_corner_threshold_cutoff() -> None:
+    # The ends of a long thin kite are much further out than its sides
+    kite = np.array([[0.0, 0.0], [40.0, -8.0], [100.0, 0.0], [40.0, 8.0]])
+    scores = TabGeometry.warp_risk_scores(kite, 10.0)
+    for threshold in (0.0, 0.1, 0.5, 0.95, 1.0, 1.01):
+        positions = TabGeometry.corner_tab_positions([kite], 1.0, threshold)
+        expected = kite[scores >= threshold]
+        assert len(positions) == len(expected), threshold
+        assert np.allclose(sorted(map(tuple, positions)), sorted(map(tuple, expected)))
+
+def test_corner_budget_takes_the_worst_first() -> None:
+    kite = np.array([[0.0, 0.0], [40.0, -8.0], [100.0, 0.0], [40.0, 8.0]])
+    assert len(TabGeometry.corner_tab_positions([kite], 1.0, 0.0, 0)) == 4
+    positions = TabGeometry.corner_tab_positions([kite], 1.0, 0.0, 2)
+    # The far ends, worst first
+    assert np.allclose(positions, [[100.0, 0.0], [0.0, 0.0]])
+    assert len(TabGeometry.corner_tab_positions([kite], 1.0, 0.0, 1)) == 1
+    # The budget is for the whole object, not each outline
+    assert len(TabGeometry.corner_tab_positions([RECTANGLE, RECTANGLE + 200.0], 10.0, 0.5, 5)) == 5
+
+def test_corner_spacing_removes_duplicates() -> None:
+    # Near every corner of a finely sampled rectangle a few points score highly, only one each should get a tab
+    outline = dense_rectangle(100.0, 50.0, 2.0)
+    positions = TabGeometry.corner_tab_positions([outline], 10.0)
+    assert len(positions) == 4
+    distances = np.hypot(*(positions[:, np.newaxis] - positions[np.newaxis]).transpose(2, 0, 1))
+    assert np.all(distances[~np.eye(len(positions), dtype=bool)] >= 10.0)
+    # A bevelled corner is two sharp points next to each other, it still only gets the one
+    bevelled = np.array([[1.0, 0.0], [99.0, 0.0], [100.0, 1.0], [100.0, 49.0], [99.0, 50.0], [1.0, 50.0], [0.0, 49.0], [0.0, 1.0]])
+    assert len(TabGeometry.corner_tab_positions([bevelled], 10.0)) == 4
+
+def test_corner_tabs_match_perimeter_corners() -> None:
+    # Corners only is a subset of what the all-round placement does with corners on, not somewhere nearby
+    outline = dense_rectangle(100.0, 50.0, 5.0)
+    corners = TabGeometry.corner_tab_positions([outline], 10.0)
+    around = TabGeometry.perimeter_tab_positions(outline, 10.0, True)
+    for corner in corners:
+        assert np.min(np.hypot(*(around - corner).T)) < 1e-6
+    assert len(around) > len(corners)
+
+def test_corner_tabs_empty() -> None:
+    assert TabGeometry.corner_tab_positions([], 10.0).shape == (0, 2)
+    assert TabGeometry.corner_tab_positions([np.zeros((0, 2))], 10.0).shape == (0, 2)
+
+#----------------------------------------
+# Finding what's near a tab
+#----------------------------------------
+
+def test_spatial_hash_tab_near() -> None:
+    placement_hash = TabGeometry.TabSpatialHash(5.0)
+    placement_hash.add_tab(10.0, 10.0, "a")
+    placement_hash.add_tab(30.0, 10.0, "b")
+    assert placement_hash.tab_near(12.0, 10.0, 3.0)
+    # Closer than, not as close as
+    assert not placement_hash.tab_near(13.0, 10.0, 3.0)
+    assert not placement_hash.tab_near(20.0, 10.0, 5.0)
+    assert placement_hash.tab_near(12.0, 10.0, 3.0, ("b",))
+    assert not placement_hash.tab_near(12.0, 10.0, 3.0, ("a",))
+    assert not placement_hash.tab_near(20.0, 10.0, 11.0, ("a", "b"))
+    # Tabs added without a key are never ignored
+    placement_hash.add_tab(50.0, 50.0)
+    assert placement_hash.tab_near(50.0, 51.0, 2.0, ("a", "b"))
+
+def test_spatial_hash_across_cells() -> None:
+    # Cells are 5 wide, these are either side of lines between them (including at negative coordinates)
+    placement_hash = TabGeometry.TabSpatialHash(5.0)
+    placement_hash.add_tab(4.9, 4.9)
+    assert placement_hash.tab_near(5.1, 5.1, 0.5)
+    placement_hash.add_tab(-0.1, -10.0)
+    assert placement_hash.tab_near(0.1, -10.0, 0.3)
+    # A distance bigger than a cell reaches past the cells next door
+    assert placement_hash.tab_near(20.0, 4.9, 15.2)
+    assert not placement_hash.tab_near(20.0, 4.9, 15.0)
+
+def test_spatial_hash_matches_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    tabs = rng.uniform(-50, 50, (200, 2))
+    placement_hash = TabGeometry.TabSpatialHash(4.0)
+    for index, (x, z) in enumerate(tabs):
+        placement_hash.add_tab(x, z, index % 7)
+    for x, z, distance in np.column_stack((rng.uniform(-60, 60, (300, 2)), rng.uniform(0.5, 12, 300))):
+        near = np.hypot(tabs[:, 0] - x, tabs[:, 1] - z) < distance
+        assert placement_hash.tab_near(x, z, distance) == near.any()
+        assert placement_hash.tab_near(x, z, distance, (0, 1)) == (near & (np.arange(200) % 7 > 1)).any()
+
+def test_spatial_hash_set_and_remove_tabs() -> None:
+    placement_hash = TabGeometry.TabSpatialHash(5.0)
+    placement_hash.set_tabs("a", [(0.0, 0.0), (20.0, 0.0)])
+    assert placement_hash.tab_near(0.0, 1.0, 2.0) and placement_hash.tab_near(20.0, 1.0, 2.0)
+    # Setting them again replaces them, like a merged tab that moved
+    placement_hash.set_tabs("a", [(40.0, 0.0)])
+    assert not placement_hash.tab_near(0.0, 1.0, 2.0) and not placement_hash.tab_near(20.0, 1.0, 2.0)
+    assert placement_hash.tab_near(40.0, 1.0, 2.0)
+    placement_hash.set_tabs("b", [(40.0, 3.0)])
+    placement_hash.remove_tabs("a")
+    assert placement_hash.tab_near(40.0, 1.0, 2.5)
+    placement_hash.remove_tabs("b")
+    assert not placement_hash.tab_near(40.0, 1.0, 100.0)
+    # Removing something that isn't there is fine
+    placement_hash.remove_tabs("c")
+
+def test_spatial_hash_outline_hit() -> None:
+    placement_hash = TabGeometry.TabSpatialHash(5.0)
+    square = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    placement_hash.add_outline("a", square)
+    placement_hash.add_outline("b", square + 30.0)
+    assert placement_hash.outline_hit(12.0, 5.0, 3.0, "b")
+    assert not placement_hash.outline_hit(14.0, 5.0, 3.0, "b")
+    # A tab on an object never runs into that object's own base
+    assert not placement_hash.outline_hit(12.0, 5.0, 3.0, "a")
+    assert not placement_hash.outline_hit(5.0, 5.0, 1.0, "a")
+    assert placement_hash.outline_hit(5.0, 5.0, 1.0, "b")
+    # Sat right on a cell boundary in the middle of the square
+    assert placement_hash.outline_hit(35.0, 35.0, 0.1, "a")
+
+def test_spatial_hash_set_and_remove_outlines() -> None:
+    placement_hash = TabGeometry.TabSpatialHash(5.0)
+    square = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    placement_hash.set_outlines("a", [square, square + 20.0])
+    assert placement_hash.outline_hit(5.0, 5.0, 1.0, None) and placement_hash.outline_hit(25.0, 25.0, 1.0, None)
+    # Replaced, and anything too small to be a shape gets left out
+    placement_hash.set_outlines("a", [square + 50.0, square[:2], None])
+    assert not placement_hash.outline_hit(5.0, 5.0, 1.0, None) and not placement_hash.outline_hit(25.0, 25.0, 1.0, None)
+    assert placement_hash.outline_hit(55.0, 55.0, 1.0, None)
+    placement_hash.remove_outlines("a")
+    assert not placement_hash.outline_hit(55.0, 55.0, 100.0, None)
+    placement_hash.remove_outlines("a")
+
+#----------------------------------------
+# Tab meshes
+#----------------------------------------
+
+def welded_edges(vertices: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Every directed edge of every triangle, with vertices in the same place counted as the same vertex.
+
+    The meshes have separate copies of vertices along sharp edges, so they only join up once those are welded."""
+    _, welded = np.unique(vertices.round(5), axis=0, return_inverse=True)
+    faces = welded.ravel()[indices]
+    return np.concatenate((faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]))
+
+def assert_closed_and_outward(vertices: np.ndarray, normals: np.ndarray, indices: np.ndarray) -> float:
+    """Check a mesh has no holes and faces the right way, and return its volume."""
+    assert indices.min() >= 0 and indices.max() < len(vertices)
+    edges = welded_edges(vertices, indices)
+    directed = set(map(tuple, edges))
+    # Closed and consistently wound: every edge is used exactly once each way
+    assert len(directed) == len(edges)
+    assert all((b, a) in directed for a, b in directed)
+    faces = vertices[indices].astype(np.float64)
+    face_normals = np.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    # Outward winding gives a positive volume (inside out would be negative)
+    volume = np.einsum("ij,ij->i", faces[:, 0], face_normals).sum() / 6.0
+    assert volume > 0
+    # Vertex normals agree with the faces using them
+    assert np.all(np.einsum("ij,ij->i", normals[indices[:, 0]], face_normals) > 0)
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-5)
+    return volume
+
+def test_cylinder_mesh() -> None:
+    for segments in (3, 8, 36, 120):
+        vertices, normals, indices = TabGeometry.create_cylinder_mesh(10.0, segments, 0.6)
+        assert vertices.shape == (4 * segments + 2, 3) and normals.shape == vertices.shape
+        assert indices.shape == (4 * segments, 3)
+        assert vertices.dtype == np.float32 and indices.dtype == np.int32
+        volume = assert_closed_and_outward(vertices, normals, indices)
+        # A prism on a regular polygon
+        assert math.isclose(volume, segments / 2 * 25.0 * math.sin(2 * math.pi / segments) * 0.6, rel_tol=1e-4)
+        assert np.isclose(vertices[:, 1].min(), 0.0) and np.isclose(vertices[:, 1].max(), 0.6)
+        assert np.isclose(np.hypot(vertices[:, 0], vertices[:, 2]).max(), 5.0)
+
+def test_dish_mesh() -> None:
+    for segments in (3, 8, 36, 120):
+        for layer_count in (1, 3):
+            vertices, normals, indices = TabGeometry.create_dish_mesh(10.0, segments, 0.2, 0.4, layer_count)
+            assert vertices.shape == (8 * segments + 2, 3) and normals.shape == vertices.shape
+            assert indices.shape == (8 * segments, 3)
+            assert vertices.dtype == np.float32 and indices.dtype == np.int32
+            assert_closed_and_outward(vertices, normals, indices)
+            assert np.isclose(vertices[:, 1].min(), 0.0)
+
+def test_tab_segments_bounds() -> None:
+    assert TabGeometry.tab_segments(0.0, 0.4) == 8
+    assert TabGeometry.tab_segments(-1.0, 0.4) == 8
+    assert TabGeometry.tab_segments(5.0, 0.0) == 8
+    # Too small to be out by more than the tolerance whatever it's made of
+    assert TabGeometry.tab_segments(0.05, 0.4) == 8
+    assert TabGeometry.tab_segments(10000.0, 0.4) == 120
+    assert TabGeometry.tab_segments(5.0, 0.4, minimum=4, maximum=6) == 6
+    assert TabGeometry.tab_segments(0.05, 0.4, minimum=4, maximum=6) == 4
+
+def test_tab_segments_tolerance() -> None:
+    previous = 0
+    for radius in np.linspace(0.5, 200.0, 400):
+        segments = TabGeometry.tab_segments(radius, 0.4)
+        assert 8 <= segments <= 120
+        # Never fewer for a bigger tab
+        assert segments >= previous
+        previous = segments
+        error = radius * (1 - math.cos(math.pi / segments))
+        if segments < 120:
+            assert error <= 0.1 + 1e-9
+        if segments > 8:
+            # And it's the fewest that do
+            assert radius * (1 - math.cos(math.pi / (segments - 1))) > 0.1
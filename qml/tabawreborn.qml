@@ -6,7 +6,12 @@
 //   "XYDistance"    : X/Y distance from model in mm
 //   "AsDish"        : Use dish shape
 //   "LayerCount"    : Number of layers for tab
+//   "BaseLayers"    : Number of layers at the bottom of an object that count as its base for automatic tabs
+//   "MergeTabs"     : Merge automatic tabs into one per object
+//   "PaintMode"     : Click and drag to paint tabs along an object instead of one per click
 //   "Notifications" : DIY toast display.
+//   "AutoProgress"  : Percentage done of automatic tabs being worked out in the background, -1 if there aren't any.
+//   "PerfStats"     : Timings of the slow bits, empty unless tabawreborn/show_timings is on. Setting it resets them.
 //
 //-----------------------------------------------------------------------------
 
@@ -111,11 +116,27 @@ Item {
         return valid ? default_field_background : error_field_background
     }
 
+    function removeTabsInRegion(){
+        // Same X and Y as the move tool shows, Y on the build plate is -Z in the scene
+        let from_x = parseFloat(regionFromX.replace(",", "."))
+        let to_x = parseFloat(regionToX.replace(",", "."))
+        let from_y = parseFloat(regionFromY.replace(",", "."))
+        let to_y = parseFloat(regionToY.replace(",", "."))
+        if (isNaN(from_x) || isNaN(to_x) || isNaN(from_y) || isNaN(to_y)){
+            errorMessage = catalog.i18nc("region_invalid", "Enter where the area starts and ends for X and Y\n")
+            return
+        }
+        errorMessage = ""
+        triggerActionWithData("removeTabs", {filter: "region", min_x: from_x, max_x: to_x, min_z: -to_y, max_z: -from_y})
+        removeRegionVisible = false
+    }
+
     function validateInputs(){
         let message = "";
         let tab_size_valid = true;
         let xy_distance_valid = true;
         let layer_count_valid = true;
+        let base_layers_valid = true;
 
         if (!validateFloat(tabSize, 0.1)){
             tab_size_valid = false;
@@ -129,11 +150,16 @@ Item {
             layer_count_valid = false;
             message += catalog.i18nc("layer_count_invalid", "Layer count must be between 1 and 100\n")
         }
+        if (!validateInt(baseLayers, 1, 10)){
+            base_layers_valid = false;
+            message += catalog.i18nc("base_layers_invalid", "Base layers must be between 1 and 10\n")
+        }
 
-        if (tab_size_valid && xy_distance_valid && layer_count_valid){
+        if (tab_size_valid && xy_distance_valid && layer_count_valid && base_layers_valid){
             setProperty("TabSize", parseFloat(tabSize))
             setProperty("XYDistance", parseFloat(xyDistance))
             setProperty("LayerCount", parseInt(layerCount))
+            setProperty("BaseLayers", parseInt(baseLayers))
             inputsValid = true
             setProperty("InputsValid", inputsValid)
         } else {
@@ -144,6 +170,7 @@ Item {
         sizeTextField.background.color = getBackgroundColour(tab_size_valid)
         xyDistanceTextField.background.color = getBackgroundColour(xy_distance_valid)
         layerCountTextField.background.color = getBackgroundColour(layer_count_valid)
+        baseLayersTextField.background.color = getBackgroundColour(base_layers_valid)
     }
 
     width: childrenRect.width
@@ -153,11 +180,22 @@ Item {
     property string tabSize: ""
     property string xyDistance: ""
     property string layerCount: ""
+    property string baseLayers: ""
     property bool asDishProp: false
+    property bool mergeTabsProp: false
+    property bool paintModeProp: false
     property string notifications: getProperty("Notifications")
+    property string perfStats: getProperty("PerfStats")
+    property int autoProgress: getProperty("AutoProgress")
 
     property bool inputsValid: false
 
+    property bool removeRegionVisible: false
+    property string regionFromX: ""
+    property string regionToX: ""
+    property string regionFromY: ""
+    property string regionToY: ""
+
     property int localwidth:UM.Theme.getSize("setting_control").width
 
     property string errorMessage: ""
@@ -168,7 +206,10 @@ Item {
         tabSize = getProperty("TabSize")
         xyDistance = getProperty("XYDistance")
         layerCount = getProperty("LayerCount")
+        baseLayers = getProperty("BaseLayers")
         asDishProp = getProperty("AsDish")
+        mergeTabsProp = getProperty("MergeTabs")
+        paintModeProp = getProperty("PaintMode")
         Qt.callLater(validateInputs)
     }
     RowLayout {
@@ -260,6 +301,25 @@ Item {
                     }
                 }
 
+                UM.Label {
+                    text: catalog.i18nc("@label", "Base layers")
+                }
+
+                UM.TextFieldWithUnit{
+                    id: baseLayersTextField
+                    Layout.minimumWidth: textFieldMinWidth
+                    height: UM.Theme.getSize("setting_control").height
+                    text: baseLayers
+                    validator: IntValidator {
+                        bottom: 1
+                        top: 10
+                    }
+                    onTextChanged: {
+                        baseLayers = text
+                        Qt.callLater(validateInputs)
+                    }
+                }
+
                 UM.CheckBox {
                     id: asDishCheckbox
                     Layout.columnSpan: 2
@@ -270,6 +330,28 @@ Item {
                         setProperty("AsDish", checked)
                     }
                 }
+
+                UM.CheckBox {
+                    id: mergeTabsCheckbox
+                    Layout.columnSpan: 2
+                    text: catalog.i18nc("@label","Merge Automatic Tabs")
+                    checked: mergeTabsProp
+                    onClicked: {
+                        mergeTabsProp = checked
+                        setProperty("MergeTabs", checked)
+                    }
+                }
+
+                UM.CheckBox {
+                    id: paintModeCheckbox
+                    Layout.columnSpan: 2
+                    text: catalog.i18nc("@label","Paint Tabs")
+                    checked: paintModeProp
+                    onClicked: {
+                        paintModeProp = checked
+                        setProperty("PaintMode", checked)
+                    }
+                }
             }
 
             Cura.TertiaryButton{
@@ -279,8 +361,81 @@ Item {
                 spacing: UM.Theme.getSize("default_margin").height
                 width: UM.Theme.getSize("setting_control").width
                 height: UM.Theme.getSize("setting_control").height
-                text: catalog.i18nc("@label", "Remove All Tabs")
-                onClicked: triggerAction("removeAllSupportMesh")
+                text: catalog.i18nc("@label", "Remove Tabs")
+                onClicked: removeTabsMenu.open()
+                Menu{
+                    id: removeTabsMenu
+                    MenuItem{
+                        text: catalog.i18nc("remove_menu", "All tabs")
+                        onClicked: triggerAction("removeAllSupportMesh")
+                    }
+                    MenuItem{
+                        text: catalog.i18nc("remove_menu", "Tabs on selected objects")
+                        onClicked: triggerActionWithData("removeTabs", {filter: "selected"})
+                    }
+                    MenuItem{
+                        text: catalog.i18nc("remove_menu", "Tabs in an area...")
+                        onClicked: removeRegionVisible = true
+                    }
+                }
+            }
+            GridLayout {
+                id: removeRegionLayout
+                Layout.fillWidth: true
+                visible: removeRegionVisible
+                columns: 3
+                columnSpacing: UM.Theme.getSize("default_margin").width
+                rowSpacing: UM.Theme.getSize("default_margin").height
+
+                UM.Label {
+                    text: catalog.i18nc("@label", "X")
+                }
+                UM.TextFieldWithUnit {
+                    Layout.minimumWidth: textFieldMinWidth
+                    height: UM.Theme.getSize("setting_control").height
+                    unit: "mm"
+                    text: regionFromX
+                    validator: DoubleValidator { decimals: 2 }
+                    onTextChanged: regionFromX = text
+                }
+                UM.TextFieldWithUnit {
+                    Layout.minimumWidth: textFieldMinWidth
+                    height: UM.Theme.getSize("setting_control").height
+                    unit: "mm"
+                    text: regionToX
+                    validator: DoubleValidator { decimals: 2 }
+                    onTextChanged: regionToX = text
+                }
+
+                UM.Label {
+                    text: catalog.i18nc("@label", "Y")
+                }
+                UM.TextFieldWithUnit {
+                    Layout.minimumWidth: textFieldMinWidth
+                    height: UM.Theme.getSize("setting_control").height
+                    unit: "mm"
+                    text: regionFromY
+                    validator: DoubleValidator { decimals: 2 }
+                    onTextChanged: regionFromY = text
+                }
+                UM.TextFieldWithUnit {
+                    Layout.minimumWidth: textFieldMinWidth
+                    height: UM.Theme.getSize("setting_control").height
+                    unit: "mm"
+                    text: regionToY
+                    validator: DoubleValidator { decimals: 2 }
+                    onTextChanged: regionToY = text
+                }
+
+                Cura.TertiaryButton {
+                    Layout.columnSpan: 2
+                    text: catalog.i18nc("@label", "Remove Tabs Here")
+                    onClicked: removeTabsInRegion()
+                }
+                Cura.TertiaryButton {
+                    text: catalog.i18nc("@label", "Cancel")
+                    onClicked: removeRegionVisible = false
+                }
             }
             Cura.SecondaryButton{
                 id: addAllButton
@@ -290,6 +445,7 @@ Item {
                 width: UM.Theme.getSize("setting_control").width
                 height: UM.Theme.getSize("setting_control").height
                 text: catalog.i18nc("@label", "Add Automatically")
+                enabled: autoProgress < 0
                 //onClicked: triggerAction("addAutoSupportMesh")
                 onClicked: automaticAddDensity.open()
                 Menu{
@@ -308,8 +464,49 @@ Item {
                             triggerActionWithData("addAutoTabMesh", {dense: false})
                         }
                     }
+                    MenuItem{
+                        text: catalog.i18nc("density_menu", "Corners only (where warping is likely)")
+                        onClicked: {
+                            validateInputs()
+                            triggerActionWithData("addAutoTabMesh", {mode: "corners"})
+                        }
+                    }
                 }
             }
+            RowLayout {
+                id: autoProgressRow
+                Layout.fillWidth: true
+                visible: autoProgress >= 0
+                UM.ProgressBar {
+                    Layout.fillWidth: true
+                    from: 0
+                    to: 100
+                    value: Math.max(autoProgress, 0)
+                }
+                UM.Label {
+                    text: Math.max(autoProgress, 0) + "%"
+                }
+                Cura.TertiaryButton{
+                    id: cancelAutoButton
+                    text: catalog.i18nc("@label", "Cancel")
+                    onClicked: triggerAction("cancelAutoTabs")
+                }
+            }
+            UM.Label {
+                id: perfStatsLabel
+                Layout.fillWidth: true
+                visible: perfStats != ""
+                text: perfStats
+                font.family: "monospace"
+                font.pointSize: 8
+                wrapMode: Text.NoWrap
+            }
+            Cura.TertiaryButton{
+                id: resetPerfStatsButton
+                visible: perfStats != ""
+                text: catalog.i18nc("@label", "Reset Timings")
+                onClicked: setProperty("PerfStats", "")
+            }
         }
         UM.Label {
             Layout.alignment: Qt.AlignTop